@@ -0,0 +1,266 @@
+"""Vectorized report analytics.
+
+The reports table is mirrored into columnar NumPy arrays that follow it
+incrementally: after the first full read, each new data version only reads
+the rows changed or deleted since the previous one. Every aggregation below
+is computed on a snapshot of those arrays without per-row Python loops.
+"""
+from datetime import datetime, timezone
+
+import numpy as np
+
+RESOLUTION_PERCENTILES = (50, 75, 90, 95, 99)
+TREND_MONTHS = 12
+SECONDS_PER_HOUR = 3600.0
+SNAPSHOT_COLUMNS = ('status', 'category', 'urgency_level', 'ward')
+NOT_RESOLVED = -1
+MAX_DEAD_SHARE = 0.25
+MIN_DEAD_FOR_RELOAD = 1000
+
+SNAPSHOT_SELECT = '''
+    SELECT
+        id, COALESCE(updated_at, ''),
+        CAST(strftime('%s', created_at) AS INTEGER),
+        COALESCE(CAST(strftime('%s', resolved_at) AS INTEGER), -1),
+        COALESCE(status, ''), category, urgency_level, COALESCE(ward, '')
+    FROM reports
+'''
+SNAPSHOT_CHANGES_SELECT = SNAPSHOT_SELECT + ' WHERE updated_at >= ? ORDER BY updated_at'
+TOMBSTONES_SELECT = '''
+    SELECT id, deleted_at FROM report_tombstones WHERE deleted_at >= ? ORDER BY deleted_at
+'''
+
+
+class ReportSnapshot:
+    """Columnar copy of the reports table with dictionary-encoded text columns.
+
+    resolved holds NOT_RESOLVED for reports that have no resolved_at.
+    """
+
+    def __init__(self, created, resolved, columns):
+        self.created = created
+        self.resolved = resolved
+        self.codes = {name: codes for name, (codes, _) in columns.items()}
+        self.labels = {name: labels for name, (_, labels) in columns.items()}
+        self.size = len(created)
+
+
+def grow(values, size, fill):
+    """A copy of a NumPy array with room for at least size entries"""
+    grown = np.full(max(size, 2 * len(values)), fill, dtype=values.dtype)
+    grown[:len(values)] = values
+    return grown
+
+
+class SnapshotBuilder:
+    """Columnar mirror of the reports table, kept in step by sync().
+
+    The first sync reads the whole table. Later ones read the rows whose
+    updated_at is at or after the latest already seen, plus newer report
+    tombstones, and overwrite those rows in place, so a write costs a few rows
+    instead of a reload. Overwriting is idempotent, so the rows of the latest
+    second are simply read again. Every write path sets updated_at to the time
+    of the write and SQLite has one writer at a time, so committed changes
+    can't land behind the cursor; a row inserted with an older updated_at is
+    caught by the row count check and forces a full reload.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.rows = {}  # report id: row number
+        self.count = 0  # row numbers handed out, including deleted rows
+        self.created = np.zeros(0, dtype=np.int64)
+        self.resolved = np.zeros(0, dtype=np.int64)
+        self.alive = np.zeros(0, dtype=bool)
+        self.codes = {name: np.zeros(0, dtype=np.int32) for name in SNAPSHOT_COLUMNS}
+        self.labels = {name: [] for name in SNAPSHOT_COLUMNS}  # code: label, in order of appearance
+        self.label_codes = {name: {} for name in SNAPSHOT_COLUMNS}
+        self.changed_cursor = None  # latest updated_at applied
+        self.deleted_cursor = None  # latest deleted_at applied
+
+    @property
+    def size(self):
+        return len(self.rows)
+
+    def sync(self, conn):
+        """Apply the rows changed and deleted since the last sync, all from one read transaction"""
+        full = self.changed_cursor is None
+        conn.execute('BEGIN')
+        try:
+            if full:
+                self.changed_cursor = conn.execute(
+                    "SELECT COALESCE(MAX(updated_at), '') FROM reports"
+                ).fetchone()[0]
+                self.deleted_cursor = conn.execute(
+                    "SELECT COALESCE(MAX(deleted_at), '') FROM report_tombstones"
+                ).fetchone()[0]
+                self.apply(conn.execute(SNAPSHOT_SELECT).fetchall())
+            else:
+                rows = conn.execute(SNAPSHOT_CHANGES_SELECT, (self.changed_cursor,)).fetchall()
+                self.apply(rows)
+                if rows:
+                    self.changed_cursor = max(self.changed_cursor, rows[-1][1])
+
+                deleted = conn.execute(TOMBSTONES_SELECT, (self.deleted_cursor,)).fetchall()
+                for key, _ in deleted:
+                    number = self.rows.pop(key, None)
+                    if number is not None:
+                        self.alive[number] = False
+                if deleted:
+                    self.deleted_cursor = max(self.deleted_cursor, deleted[-1][1])
+            total = conn.execute('SELECT COUNT(*) FROM reports').fetchone()[0]
+        finally:
+            conn.rollback()
+
+        dead = self.count - self.size
+        if not full and (total != self.size or (dead >= MIN_DEAD_FOR_RELOAD and dead > MAX_DEAD_SHARE * self.count)):
+            self.reset()
+            self.sync(conn)
+
+    def apply(self, rows):
+        """Store SNAPSHOT_SELECT rows, replacing the earlier version of any report already held"""
+        if not rows:
+            return
+        keys, _, created, resolved, *texts = zip(*rows)
+        numbers = np.empty(len(keys), dtype=np.int64)
+        for position, key in enumerate(keys):
+            number = self.rows.get(key)
+            if number is None:
+                number = self.rows[key] = self.count
+                self.count += 1
+            numbers[position] = number
+
+        if self.count > len(self.alive):
+            self.created = grow(self.created, self.count, 0)
+            self.resolved = grow(self.resolved, self.count, NOT_RESOLVED)
+            self.alive = grow(self.alive, self.count, False)
+            for name in SNAPSHOT_COLUMNS:
+                self.codes[name] = grow(self.codes[name], self.count, 0)
+
+        self.created[numbers] = created
+        self.resolved[numbers] = resolved
+        self.alive[numbers] = True
+        # The columns are low-cardinality, so a dict lookup per value is much
+        # cheaper than np.unique, which has to sort an object array
+        for name, values in zip(SNAPSHOT_COLUMNS, texts):
+            codes, labels = self.label_codes[name], self.labels[name]
+            for value in set(values).difference(codes):
+                codes[value] = len(labels)
+                labels.append(value)
+            self.codes[name][numbers] = np.fromiter(map(codes.__getitem__, values), dtype=np.int32, count=len(values))
+
+    def snapshot(self):
+        """A ReportSnapshot of the live rows, with the labels in use in sorted order"""
+        live = np.flatnonzero(self.alive[:self.count])
+        columns = {}
+        for name in SNAPSHOT_COLUMNS:
+            codes, labels = self.codes[name][live], self.labels[name]
+            used = sorted(np.flatnonzero(np.bincount(codes, minlength=len(labels))).tolist(), key=labels.__getitem__)
+            recode = np.zeros(len(labels), dtype=np.int32)
+            recode[used] = np.arange(len(used), dtype=np.int32)
+            columns[name] = (recode[codes], [labels[code] for code in used])
+        return ReportSnapshot(self.created[live], self.resolved[live], columns)
+
+
+def load_snapshot(conn):
+    """Read the columns analytics needs from SQLite into a one-off snapshot"""
+    builder = SnapshotBuilder()
+    builder.sync(conn)
+    return builder.snapshot()
+
+
+def monthly_trend(snapshot, now, months=TREND_MONTHS):
+    """Reports created, and those created and since resolved, per month"""
+    current_month = (now.year - 1970) * 12 + now.month - 1
+    first_month = current_month - months + 1
+
+    month_index = snapshot.created.astype('datetime64[s]').astype('datetime64[M]').astype(np.int64)
+    offsets = month_index - first_month
+    in_window = (offsets >= 0) & (offsets < months)
+
+    created_counts = np.bincount(offsets[in_window], minlength=months)
+    resolved_mask = in_window & status_mask(snapshot, 'resolved')
+    resolved_counts = np.bincount(offsets[resolved_mask], minlength=months)
+
+    trend = []
+    for offset in range(months):
+        month = first_month + offset
+        trend.append({
+            'month': f"{1970 + month // 12:04d}-{month % 12 + 1:02d}",
+            'reports': int(created_counts[offset]),
+            'resolved': int(resolved_counts[offset])
+        })
+    return trend
+
+
+def status_mask(snapshot, status):
+    """Boolean mask of reports with the given status"""
+    labels = snapshot.labels['status']
+    if status not in labels:
+        return np.zeros(snapshot.size, dtype=bool)
+    return snapshot.codes['status'] == labels.index(status)
+
+
+def percentile_summary(hours):
+    """Count and percentiles of a duration array"""
+    if hours.size == 0:
+        return {'count': 0, **{f'p{p}': None for p in RESOLUTION_PERCENTILES}}
+    values = np.percentile(hours, RESOLUTION_PERCENTILES)
+    return {
+        'count': int(hours.size),
+        **{f'p{p}': round(float(value), 2) for p, value in zip(RESOLUTION_PERCENTILES, values)}
+    }
+
+
+def resolution_times(snapshot):
+    """Submitted-to-resolved percentiles in hours, overall and per category.
+
+    resolved_at is set by a trigger when the status changes to 'resolved', so
+    later comments and repeated status updates don't move it.
+    """
+    resolved = status_mask(snapshot, 'resolved') & (snapshot.resolved >= snapshot.created)
+    hours = (snapshot.resolved - snapshot.created)[resolved] / SECONDS_PER_HOUR
+    categories = snapshot.codes['category'][resolved]
+
+    # Sort once by category so each group is a contiguous slice
+    order = np.argsort(categories, kind='stable')
+    sorted_hours = hours[order]
+    boundaries = np.searchsorted(categories[order], np.arange(len(snapshot.labels['category']) + 1))
+
+    by_category = {}
+    for code, label in enumerate(snapshot.labels['category']):
+        group = sorted_hours[boundaries[code]:boundaries[code + 1]]
+        if group.size:
+            by_category[label] = percentile_summary(group)
+
+    return {**percentile_summary(hours), 'by_category': by_category}
+
+
+def ward_heatmap(snapshot, column):
+    """Ward by column count matrix, wards ordered by total reports"""
+    wards = snapshot.labels['ward']
+    values = snapshot.labels[column]
+    cells = snapshot.codes['ward'].astype(np.int64) * len(values) + snapshot.codes[column]
+    matrix = np.bincount(cells, minlength=len(wards) * len(values)).reshape(len(wards), len(values))
+
+    keep = [index for index in np.argsort(-matrix.sum(axis=1), kind='stable') if wards[index] != '']
+    return {
+        'wards': [wards[index] for index in keep],
+        column: values,
+        'counts': matrix[keep].tolist()
+    }
+
+
+def compute_analytics(snapshot, now=None):
+    """All extended analytics sections for a snapshot"""
+    now = now or datetime.now(timezone.utc)
+    return {
+        'monthly_trend': monthly_trend(snapshot, now),
+        'resolution_hours': resolution_times(snapshot),
+        'ward_heatmap': {
+            'category': ward_heatmap(snapshot, 'category'),
+            'status': ward_heatmap(snapshot, 'status')
+        }
+    }
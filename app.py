@@ -1,11 +1,48 @@
-from flask import Flask, render_template, request, jsonify, redirect
+from flask import Flask, Request, Response, g, has_request_context, render_template, request, jsonify, redirect, send_file, send_from_directory
 from datetime import datetime
+import base64
+import bisect
+import cProfile
+import collections
+import csv
+import glob
+import gzip
+import hashlib
+import io
+import itertools
+import time
 import uuid
 import json
+import math
+import mimetypes
 import os
+import queue
+import re
 import sqlite3
+import tempfile
+import threading
 from dotenv import load_dotenv
+from werkzeug.exceptions import RequestEntityTooLarge
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from functools import lru_cache, wraps
+
+import chat_intents
+
+try:
+    import orjson
+except ImportError:  # optional, json_response() falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional, responses are then gzip-compressed only
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # not on Windows, where a write-behind queue then only replays its own journal
+    fcntl = None
 
 # Load environment variables from .env file
 load_dotenv()
@@ -13,113 +50,681 @@ load_dotenv()
 app = Flask(__name__)
 app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "dev-secret-key")
 app.config["DATABASE"] = os.getenv("DATABASE_PATH", "citycare.db")
+app.config["DB_POOL_SIZE"] = int(os.getenv("DB_POOL_SIZE", "8"))
+app.config["DB_BUSY_TIMEOUT_MS"] = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+app.config["DB_STATEMENT_CACHE_SIZE"] = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+app.config["WRITE_BEHIND"] = os.getenv("WRITE_BEHIND", "0").lower() in ("1", "true", "yes")
+app.config["WRITE_BEHIND_JOURNAL"] = os.getenv("WRITE_BEHIND_JOURNAL")  # default: <DATABASE>.journal, plus .<pid> per process
+app.config["WRITE_BEHIND_BATCH_SIZE"] = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "500"))
+app.config["WRITE_BEHIND_LINGER_MS"] = int(os.getenv("WRITE_BEHIND_LINGER_MS", "20"))
+app.config["SLOW_QUERY_MS"] = float(os.getenv("SLOW_QUERY_MS", "100"))
+app.config["PROFILING_ENABLED"] = os.getenv("PROFILING_ENABLED", "0").lower() in ("1", "true", "yes")
+app.config["PROFILE_DIR"] = os.getenv("PROFILE_DIR", "profiles")
+app.config["MEDIA_ROOT"] = os.getenv("MEDIA_ROOT", "media")
+app.config["MEDIA_MAX_BYTES"] = int(os.getenv("MEDIA_MAX_BYTES", str(10 * 1024 * 1024)))
+app.config["MEDIA_THUMBNAIL_WORKERS"] = int(os.getenv("MEDIA_THUMBNAIL_WORKERS", "2"))
+app.config["COMPRESS_MIN_SIZE"] = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+# Each open /api/events stream holds a worker thread unless the app runs on a
+# cooperative server (e.g. gunicorn -k gevent), so streaming is opt-in
+app.config["SSE_ENABLED"] = os.getenv("SSE_ENABLED", "0").lower() in ("1", "true", "yes")
+app.config["SSE_MAX_SUBSCRIBERS"] = int(os.getenv("SSE_MAX_SUBSCRIBERS", "100"))
 
 # Database setup
-def init_db():
-    """Initialize the SQLite database with required tables"""
-    with database_connection() as conn:
-        cursor = conn.cursor()
-        
-        # Reports table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS reports (
-                id TEXT PRIMARY KEY,
-                category TEXT NOT NULL,
-                title TEXT NOT NULL,
-                description TEXT NOT NULL,
-                urgency_level TEXT NOT NULL,
-                latitude REAL NOT NULL,
-                longitude REAL NOT NULL,
-                address TEXT NOT NULL,
-                landmark TEXT,
-                ward TEXT,
-                contact_email TEXT NOT NULL,
-                contact_phone TEXT,
-                status TEXT DEFAULT 'submitted',
-                image_paths TEXT DEFAULT '[]',
-                upvotes INTEGER DEFAULT 0,
-                comments_count INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Comments table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS report_comments (
-                id TEXT PRIMARY KEY,
-                report_id TEXT NOT NULL,
-                user_id TEXT NOT NULL,
-                user_name TEXT NOT NULL,
-                text TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (report_id) REFERENCES reports (id) ON DELETE CASCADE
-            )
-        ''')
-        
-        # WhatsApp groups table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS whatsapp_groups (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                description TEXT NOT NULL,
-                location TEXT NOT NULL,
-                link TEXT NOT NULL,
-                member_count INTEGER DEFAULT 1,
-                activity TEXT DEFAULT 'New',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                created_by TEXT DEFAULT 'user'
-            )
-        ''')
+def init_db(conn):
+    """Create the tables and apply pending migrations on an open connection"""
+    cursor = conn.cursor()
+    
+    # Reports table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS reports (
+            id TEXT PRIMARY KEY,
+            category TEXT NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL,
+            urgency_level TEXT NOT NULL,
+            latitude REAL NOT NULL,
+            longitude REAL NOT NULL,
+            address TEXT NOT NULL,
+            landmark TEXT,
+            ward TEXT,
+            contact_email TEXT NOT NULL,
+            contact_phone TEXT,
+            status TEXT DEFAULT 'submitted',
+            image_paths TEXT DEFAULT '[]',
+            upvotes INTEGER DEFAULT 0,
+            comments_count INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Comments table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS report_comments (
+            id TEXT PRIMARY KEY,
+            report_id TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            user_name TEXT NOT NULL,
+            text TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (report_id) REFERENCES reports (id) ON DELETE CASCADE
+        )
+    ''')
+    
+    # WhatsApp groups table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS whatsapp_groups (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT NOT NULL,
+            location TEXT NOT NULL,
+            link TEXT NOT NULL,
+            member_count INTEGER DEFAULT 1,
+            activity TEXT DEFAULT 'New',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            created_by TEXT DEFAULT 'user'
+        )
+    ''')
+    
+    # Forum posts table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS forum_posts (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            category TEXT NOT NULL,
+            author TEXT DEFAULT 'User',
+            author_initials TEXT DEFAULT 'US',
+            comments INTEGER DEFAULT 0,
+            views INTEGER DEFAULT 0,
+            likes INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    conn.commit()
+    
+    run_migrations(conn)
+
+# Dimensions kept in the report_counters summary table, mapped to the column
+# they follow and the expression that derives the counter value from a row
+REPORT_COUNTER_DIMENSIONS = {
+    'status': ('status', '{row}.status'),
+    'category': ('category', '{row}.category'),
+    'urgency_level': ('urgency_level', '{row}.urgency_level'),
+    'ward': ('ward', "COALESCE({row}.ward, '')"),
+    'day': ('created_at', 'DATE({row}.created_at)'),
+    'contact_email': ('contact_email', '{row}.contact_email')
+}
+
+def report_counter_statements():
+    """SQL that creates report_counters and the triggers maintaining it"""
+    def increment(dimension, expression):
+        return (
+            f"INSERT INTO report_counters (dimension, value, count) "
+            f"VALUES ('{dimension}', {expression.format(row='NEW')}, 1) "
+            f"ON CONFLICT (dimension, value) DO UPDATE SET count = count + 1;"
+        )
+    
+    def decrement(dimension, expression):
+        return (
+            f"UPDATE report_counters SET count = count - 1 "
+            f"WHERE dimension = '{dimension}' AND value = {expression.format(row='OLD')};"
+        )
+    
+    statements = [
+        '''
+        CREATE TABLE IF NOT EXISTS report_counters (
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, value)
+        ) WITHOUT ROWID
+        ''',
+        'CREATE TRIGGER IF NOT EXISTS report_counters_insert AFTER INSERT ON reports BEGIN '
+        + ' '.join(increment(dimension, expression) for dimension, (_, expression) in REPORT_COUNTER_DIMENSIONS.items())
+        + ' END',
+        'CREATE TRIGGER IF NOT EXISTS report_counters_delete AFTER DELETE ON reports BEGIN '
+        + ' '.join(decrement(dimension, expression) for dimension, (_, expression) in REPORT_COUNTER_DIMENSIONS.items())
+        + ' END'
+    ]
+    
+    # One update trigger per dimension, so a status change only touches status
+    for dimension, (column, expression) in REPORT_COUNTER_DIMENSIONS.items():
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS report_counters_update_{dimension} "
+            f"AFTER UPDATE OF {column} ON reports "
+            f"WHEN {expression.format(row='OLD')} IS NOT {expression.format(row='NEW')} BEGIN "
+            f"{decrement(dimension, expression)} {increment(dimension, expression)} END"
+        )
+    
+    statements.append('DELETE FROM report_counters')
+    statements.extend(report_counter_backfill_statements())
+    return statements
+
+def report_counter_backfill_statements():
+    """SQL that recomputes report_counters from the reports table"""
+    return [
+        f"INSERT INTO report_counters (dimension, value, count) "
+        f"SELECT '{dimension}', {expression.format(row='reports')}, COUNT(*) FROM reports GROUP BY 2"
+        for dimension, (_, expression) in REPORT_COUNTER_DIMENSIONS.items()
+    ]
+
+# Schema migrations, applied in order. PRAGMA user_version records how many
+# have run, so each list of statements executes exactly once per database.
+MIGRATIONS = [
+    # 1: indexes for the report, comment and forum access paths
+    [
+        'CREATE INDEX IF NOT EXISTS idx_reports_created_at ON reports (created_at, id)',
+        'CREATE INDEX IF NOT EXISTS idx_reports_status_created_at ON reports (status, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_reports_category_created_at ON reports (category, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_reports_urgency_level ON reports (urgency_level)',
+        'CREATE INDEX IF NOT EXISTS idx_reports_ward ON reports (ward)',
+        'CREATE INDEX IF NOT EXISTS idx_reports_contact_email_created_at ON reports (contact_email, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_report_comments_report_id_created_at ON report_comments (report_id, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_forum_posts_created_at ON forum_posts (created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_whatsapp_groups_created_at ON whatsapp_groups (created_at)'
+    ],
+    # 2: R*Tree spatial index over report coordinates, kept in sync by triggers.
+    # Entries are matched by the report_id auxiliary column rather than the
+    # reports rowid, which VACUUM is free to renumber.
+    [
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS reports_rtree USING rtree(
+            id, min_lat, max_lat, min_lng, max_lng, +report_id
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS reports_rtree_insert AFTER INSERT ON reports
+        BEGIN
+            INSERT INTO reports_rtree (min_lat, max_lat, min_lng, max_lng, report_id)
+            VALUES (NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude, NEW.id);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS reports_rtree_delete AFTER DELETE ON reports
+        BEGIN
+            DELETE FROM reports_rtree WHERE id IN (
+                SELECT id FROM reports_rtree
+                WHERE min_lat <= OLD.latitude AND max_lat >= OLD.latitude
+                AND min_lng <= OLD.longitude AND max_lng >= OLD.longitude
+                AND report_id = OLD.id
+            );
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS reports_rtree_update AFTER UPDATE OF latitude, longitude ON reports
+        BEGIN
+            DELETE FROM reports_rtree WHERE id IN (
+                SELECT id FROM reports_rtree
+                WHERE min_lat <= OLD.latitude AND max_lat >= OLD.latitude
+                AND min_lng <= OLD.longitude AND max_lng >= OLD.longitude
+                AND report_id = OLD.id
+            );
+            INSERT INTO reports_rtree (min_lat, max_lat, min_lng, max_lng, report_id)
+            VALUES (NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude, NEW.id);
+        END
+        ''',
+        '''
+        INSERT INTO reports_rtree (min_lat, max_lat, min_lng, max_lng, report_id)
+        SELECT latitude, latitude, longitude, longitude, id FROM reports
+        '''
+    ],
+    # 3: FTS5 full-text index over report text, using reports as external
+    # content so the text is not stored twice. 'rebuild' backfills existing rows.
+    [
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5(
+            title, description, address, landmark,
+            content='reports', content_rowid='rowid',
+            prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS reports_fts_insert AFTER INSERT ON reports
+        BEGIN
+            INSERT INTO reports_fts (rowid, title, description, address, landmark)
+            VALUES (NEW.rowid, NEW.title, NEW.description, NEW.address, NEW.landmark);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS reports_fts_delete AFTER DELETE ON reports
+        BEGIN
+            INSERT INTO reports_fts (reports_fts, rowid, title, description, address, landmark)
+            VALUES ('delete', OLD.rowid, OLD.title, OLD.description, OLD.address, OLD.landmark);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS reports_fts_update
+        AFTER UPDATE OF title, description, address, landmark ON reports
+        BEGIN
+            INSERT INTO reports_fts (reports_fts, rowid, title, description, address, landmark)
+            VALUES ('delete', OLD.rowid, OLD.title, OLD.description, OLD.address, OLD.landmark);
+            INSERT INTO reports_fts (rowid, title, description, address, landmark)
+            VALUES (NEW.rowid, NEW.title, NEW.description, NEW.address, NEW.landmark);
+        END
+        ''',
+        "INSERT INTO reports_fts (reports_fts) VALUES ('rebuild')"
+    ],
+    # 4: summary counters by status, category, urgency, ward, day and reporter
+    report_counter_statements(),
+    # 5: change counters bumped by every write, used for ETags
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            scope TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        ''',
+        "INSERT OR IGNORE INTO data_versions (scope, version) VALUES ('reports', 0), ('community', 0)"
+    ] + [
+        f"CREATE TRIGGER IF NOT EXISTS data_versions_{table}_{event.lower()} AFTER {event} ON {table} "
+        f"BEGIN UPDATE data_versions SET version = version + 1 WHERE scope = '{scope}'; END"
+        for table, scope in [
+            ('reports', 'reports'),
+            ('report_comments', 'reports'),
+            ('forum_posts', 'community'),
+            ('whatsapp_groups', 'community')
+        ]
+        for event in ('INSERT', 'UPDATE', 'DELETE')
+    ],
+    # 6: delta sync support, an updated_at index and tombstones for deletes
+    [
+        'CREATE INDEX IF NOT EXISTS idx_reports_updated_at ON reports (updated_at, id)',
+        '''
+        CREATE TABLE IF NOT EXISTS report_tombstones (
+            id TEXT PRIMARY KEY,
+            deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_report_tombstones_deleted_at ON report_tombstones (deleted_at, id)',
+        '''
+        CREATE TRIGGER IF NOT EXISTS report_tombstones_delete AFTER DELETE ON reports
+        BEGIN
+            INSERT OR REPLACE INTO report_tombstones (id, deleted_at) VALUES (OLD.id, CURRENT_TIMESTAMP);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS report_tombstones_insert AFTER INSERT ON reports
+        BEGIN
+            DELETE FROM report_tombstones WHERE id = NEW.id;
+        END
+        '''
+    ],
+    # 7: content-addressed media uploads
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS media (
+            hash TEXT PRIMARY KEY,
+            content_type TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID
+        '''
+    ],
+    # 8: when a report was resolved, which updated_at loses on the next comment
+    [
+        'ALTER TABLE reports ADD COLUMN resolved_at TIMESTAMP',
+        # The last write is the best record older reports have
+        "UPDATE reports SET resolved_at = updated_at WHERE status = 'resolved'",
+        '''
+        CREATE TRIGGER IF NOT EXISTS reports_resolved_at_update AFTER UPDATE OF status ON reports
+        WHEN NEW.status IS NOT OLD.status
+        BEGIN
+            UPDATE reports SET resolved_at = CASE WHEN NEW.status = 'resolved' THEN CURRENT_TIMESTAMP END
+            WHERE rowid = NEW.rowid;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS reports_resolved_at_insert AFTER INSERT ON reports
+        WHEN NEW.status = 'resolved' AND NEW.resolved_at IS NULL
+        BEGIN
+            UPDATE reports SET resolved_at = COALESCE(NEW.updated_at, CURRENT_TIMESTAMP) WHERE rowid = NEW.rowid;
+        END
+        '''
+    ]
+]
+
+def run_migrations(conn):
+    """Apply pending schema migrations, one transaction per version.
+    
+    Each transaction takes the write lock up front and re-reads user_version
+    under it, so concurrent processes apply every migration exactly once; the
+    backfills are not idempotent.
+    """
+    for version, statements in enumerate(MIGRATIONS, start=1):
+        conn.execute('BEGIN IMMEDIATE')
+        if conn.execute('PRAGMA user_version').fetchone()[0] >= version:
+            conn.rollback()
+            continue
         
-        # Forum posts table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS forum_posts (
-                id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                category TEXT NOT NULL,
-                author TEXT DEFAULT 'User',
-                author_initials TEXT DEFAULT 'US',
-                comments INTEGER DEFAULT 0,
-                views INTEGER DEFAULT 0,
-                likes INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        try:
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {version}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
         
-        conn.commit()
+        print(f"🛠️ Applied database migration {version}")
+
+# Metrics, exposed in the Prometheus text format at /metrics
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+class Histogram:
+    """Bucketed observations, rendered with cumulative le buckets"""
+    
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+    
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+class MetricsRegistry:
+    """Labelled counters and histograms shared by all request threads"""
+    
+    def __init__(self):
+        self._families = {}
+        self._lock = threading.Lock()
+    
+    def counter(self, name, help_text):
+        self._families[name] = {'type': 'counter', 'help': help_text, 'series': {}}
+    
+    def histogram(self, name, help_text, buckets):
+        self._families[name] = {'type': 'histogram', 'help': help_text, 'buckets': buckets, 'series': {}}
+    
+    def inc(self, name, labels=None, value=1):
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            series = self._families[name]['series']
+            series[key] = series.get(key, 0) + value
+    
+    def observe(self, name, labels, value):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            family = self._families[name]
+            if key not in family['series']:
+                family['series'][key] = Histogram(family['buckets'])
+            family['series'][key].observe(value)
+    
+    def render(self):
+        """All series in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, family in self._families.items():
+                lines.append(f"# HELP {name} {family['help']}")
+                lines.append(f"# TYPE {name} {family['type']}")
+                for key, value in family['series'].items():
+                    if family['type'] == 'counter':
+                        lines.append(f"{name}{format_labels(key)} {value}")
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(value.buckets + ('+Inf',), value.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{format_labels(key + (('le', str(bound)),))} {cumulative}")
+                    lines.append(f"{name}_sum{format_labels(key)} {value.sum}")
+                    lines.append(f"{name}_count{format_labels(key)} {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+def escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(key):
+    """Render ((label, value), ...) as a Prometheus label set"""
+    if not key:
+        return ''
+    return '{' + ','.join(f'{label}="{escape_label_value(value)}"' for label, value in key) + '}'
+
+metrics = MetricsRegistry()
+metrics.counter('citycare_requests_total', 'HTTP requests by route, method and status')
+metrics.histogram('citycare_request_duration_seconds', 'Request latency by route', LATENCY_BUCKETS)
+metrics.histogram('citycare_request_sql_queries', 'SQL statements executed per request', QUERY_COUNT_BUCKETS)
+metrics.histogram('citycare_request_sql_seconds', 'Time spent in SQLite per request', LATENCY_BUCKETS)
+metrics.counter('citycare_sql_queries_total', 'SQL statements executed')
+metrics.counter('citycare_sql_seconds_total', 'Time spent in SQLite')
+metrics.counter('citycare_slow_queries_total', 'Statements slower than SLOW_QUERY_MS')
+
+def record_sql(queries, elapsed):
+    """Add statement time to the global counters and the current request"""
+    if queries:
+        metrics.inc('citycare_sql_queries_total', value=queries)
+    metrics.inc('citycare_sql_seconds_total', value=elapsed)
+    if has_request_context():
+        g.sql_queries = g.get('sql_queries', 0) + queries
+        g.sql_seconds = g.get('sql_seconds', 0.0) + elapsed
+
+def log_slow_query(sql, elapsed):
+    route = request.path if has_request_context() else 'background'
+    metrics.inc('citycare_slow_queries_total')
+    print(f"🐢 Slow query ({elapsed * 1000:.1f} ms) on {route}: {' '.join(sql.split())}")
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times each statement, including its fetches"""
+    
+    _sql = ''
+    _elapsed = 0.0
+    _logged = False
+    
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._start_statement(sql, time.perf_counter() - start)
+    
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._start_statement(sql, time.perf_counter() - start)
+    
+    def fetchone(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            self._add_time(time.perf_counter() - start)
+    
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            self._add_time(time.perf_counter() - start)
+    
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._add_time(time.perf_counter() - start)
+    
+    def _start_statement(self, sql, elapsed):
+        self._sql = sql
+        self._elapsed = 0.0
+        self._logged = False
+        self._add_time(elapsed, queries=1)
+    
+    def _add_time(self, elapsed, queries=0):
+        record_sql(queries, elapsed)
+        self._elapsed += elapsed
+        if not self._logged and self._elapsed * 1000 >= app.config["SLOW_QUERY_MS"]:
+            self._logged = True
+            log_slow_query(self._sql, self._elapsed)
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors, including the execute() shortcuts, are instrumented"""
+    
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+PROFILE_HEADER = 'X-Profile'
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    g.sql_queries = 0
+    g.sql_seconds = 0.0
+    
+    # Opt-in per request; PROFILING_ENABLED keeps clients from turning it on in production
+    if app.config["PROFILING_ENABLED"] and request.headers.get(PROFILE_HEADER):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another request is already being profiled
+            return
+        g.profiler = profiler
+
+@app.before_request
+def start_write_queue():
+    # Replays anything a previous process left in the journal; a no-op when WRITE_BEHIND is off
+    get_report_write_queue()
+
+@app.after_request
+def record_request_metrics(response):
+    """Observe latency and SQL cost, and write the profile if one was requested"""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(app.config["PROFILE_DIR"], exist_ok=True)
+        profile_path = os.path.join(
+            app.config["PROFILE_DIR"],
+            f"{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}-{request.endpoint}-{uuid.uuid4().hex[:8]}.prof"
+        )
+        profiler.dump_stats(profile_path)
+        response.headers['X-Profile-File'] = profile_path
+    
+    elapsed = time.perf_counter() - g.request_started
+    labels = {'route': request.url_rule.rule if request.url_rule else 'unmatched', 'method': request.method}
+    metrics.inc('citycare_requests_total', {**labels, 'status': str(response.status_code)})
+    metrics.observe('citycare_request_duration_seconds', labels, elapsed)
+    metrics.observe('citycare_request_sql_queries', labels, g.sql_queries)
+    metrics.observe('citycare_request_sql_seconds', labels, g.sql_seconds)
+    response.headers['Server-Timing'] = f"app;dur={elapsed * 1000:.1f}, db;dur={g.sql_seconds * 1000:.1f}"
+    return response
+
+class ConnectionPool:
+    """Pool of open SQLite connections shared by all request threads"""
+    
+    def __init__(self, database, size):
+        self.database = database
+        self.size = size
+        self._idle = queue.LifoQueue(maxsize=size)
+    
+    def _connect(self):
+        """Open a new connection and apply the per-connection pragmas"""
+        conn = sqlite3.connect(
+            self.database,
+            timeout=app.config["DB_BUSY_TIMEOUT_MS"] / 1000,
+            check_same_thread=False,
+            cached_statements=app.config["DB_STATEMENT_CACHE_SIZE"],
+            factory=InstrumentedConnection
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {app.config['DB_BUSY_TIMEOUT_MS']}")
+        conn.execute("PRAGMA cache_size = -16000")  # 16 MB page cache
+        conn.execute("PRAGMA mmap_size = 268435456")  # 256 MB memory map
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+    
+    def acquire(self):
+        """Take an idle connection or open a new one"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        conn.row_factory = sqlite3.Row  # This enables column access by name
+        return conn
+    
+    def release(self, conn):
+        """Return a connection to the pool, discarding uncommitted work"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put_nowait(conn)
+        except (queue.Full, sqlite3.Error):
+            conn.close()
+    
+    def close_all(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_connection_pool():
+    """Return the pool for the configured database, creating it if needed"""
+    global _pool
+    database = app.config["DATABASE"]
+    with _pool_lock:
+        if _pool is None or _pool.database != database:
+            if _pool is not None:
+                _pool.close_all()
+            pool = ConnectionPool(database, app.config["DB_POOL_SIZE"])
+            
+            # Workers only check the schema; migrating is left to `flask init-db`
+            # so a fleet of pre-forked workers never races to apply it
+            conn = pool.acquire()
+            try:
+                schema_version = conn.execute('PRAGMA user_version').fetchone()[0]
+            finally:
+                pool.release(conn)
+            if schema_version < len(MIGRATIONS):
+                pool.close_all()
+                raise RuntimeError(
+                    f"Database schema of {database} is at version {schema_version} of {len(MIGRATIONS)}, "
+                    "run `flask --app app init-db` first"
+                )
+            _pool = pool
+        return _pool
 
 @contextmanager
 def database_connection():
     """Context manager for database connections"""
-    conn = sqlite3.connect(app.config["DATABASE"])
-    conn.row_factory = sqlite3.Row  # This enables column access by name
+    pool = get_connection_pool()
+    conn = pool.acquire()
     try:
         yield conn
     finally:
-        conn.close()
-
-# Initialize database
-init_db()
+        pool.release(conn)
 
 # Helper functions for database operations
 def dict_factory(cursor, row):
     """Convert database row to dictionary"""
-    d = {}
-    for idx, col in enumerate(cursor.description):
-        value = row[idx]
-        # Convert datetime strings to ISO format if needed
-        if isinstance(value, str) and 'T' in value and ':' in value:
-            try:
-                # Try to parse as datetime
-                d[col[0]] = value
-            except:
-                d[col[0]] = value
-        else:
-            d[col[0]] = value
-    return d
+    return dict(zip(column_names(cursor), row))
+
+def column_names(cursor):
+    """Column names of the cursor's current result set"""
+    return tuple(column[0] for column in cursor.description)
+
+def parse_image_paths(value):
+    """Decode the stored image_paths JSON, treating empty or bad values as no images"""
+    if not value or value == '[]':
+        return []
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        return []
 
 def serialize_report(report):
     """Serialize a report with proper data types"""
@@ -129,16 +734,7 @@ def serialize_report(report):
         report_dict = dict(report)
     
     # Ensure proper data types
-    if 'image_paths' in report_dict and report_dict['image_paths']:
-        if isinstance(report_dict['image_paths'], str):
-            try:
-                report_dict['image_paths'] = json.loads(report_dict['image_paths'])
-            except:
-                report_dict['image_paths'] = []
-        else:
-            report_dict['image_paths'] = report_dict['image_paths']
-    else:
-        report_dict['image_paths'] = []
+    report_dict['image_paths'] = parse_image_paths(report_dict.get('image_paths'))
     
     # Ensure location object is properly structured
     if 'latitude' in report_dict and 'longitude' in report_dict:
@@ -159,6 +755,499 @@ def serialize_report(report):
     
     return report_dict
 
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LATITUDE = 111.32
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+def bounding_box(lat, lng, radius_km):
+    """Latitude/longitude box that contains every point within radius_km"""
+    d_lat = radius_km / KM_PER_DEGREE_LATITUDE
+    cos_lat = math.cos(math.radians(lat))
+    d_lng = 180.0 if cos_lat < 1e-6 else min(radius_km / (KM_PER_DEGREE_LATITUDE * cos_lat), 180.0)
+    return lat - d_lat, lat + d_lat, lng - d_lng, lng + d_lng
+
+# Column weights for bm25(): title, description, address, landmark
+REPORT_SEARCH_WEIGHTS = (10.0, 4.0, 2.0, 2.0)
+
+def build_fts_query(search):
+    """Turn free text into an FTS5 query that prefix-matches every word"""
+    terms = re.findall(r'\w+', search.lower())
+    return ' '.join(f'"{term}"*' for term in terms)
+
+def build_report_filter_query(statuses=None, categories=None, search=None, select='reports.*'):
+    """SQL and parameters for reports matching the status, category and search filters"""
+    fts_query = build_fts_query(search) if search else ''
+    
+    if fts_query:
+        weights = ', '.join(str(weight) for weight in REPORT_SEARCH_WEIGHTS)
+        query = f'''
+            SELECT {select} FROM reports_fts 
+            JOIN reports ON reports.rowid = reports_fts.rowid 
+            WHERE reports_fts MATCH ?
+        '''
+        params = [fts_query]
+        order_by = f" ORDER BY bm25(reports_fts, {weights}), reports.created_at DESC"
+    else:
+        query = f"SELECT {select} FROM reports WHERE 1=1"
+        params = []
+        order_by = " ORDER BY created_at DESC"
+    
+    if statuses:
+        placeholders = ','.join(['?'] * len(statuses))
+        query += f" AND reports.status IN ({placeholders})"
+        params.extend(statuses)
+    
+    if categories:
+        placeholders = ','.join(['?'] * len(categories))
+        query += f" AND reports.category IN ({placeholders})"
+        params.extend(categories)
+    
+    query += order_by
+    return query, params
+
+# SQLite caps the number of bound parameters per statement, so large id lists
+# are fetched in chunks of this size.
+ID_BATCH_SIZE = 500
+
+REPORT_COMMENTS_SQL = '''
+    SELECT * FROM report_comments 
+    WHERE report_id IN ({placeholders}) 
+    ORDER BY report_id, created_at
+'''
+
+def load_report_comments(cursor, report_ids):
+    """Fetch comments for many reports at once, grouped by report id"""
+    comments_by_report = {report_id: [] for report_id in report_ids}
+    ids = list(comments_by_report)
+    
+    # Callers may use tuple rows, so comments get their own dict cursor
+    cursor = cursor.connection.cursor()
+    cursor.row_factory = dict_factory
+    
+    for start in range(0, len(ids), ID_BATCH_SIZE):
+        chunk = ids[start:start + ID_BATCH_SIZE]
+        placeholders = ','.join(['?'] * len(chunk))
+        cursor.execute(REPORT_COMMENTS_SQL.format(placeholders=placeholders), chunk)
+        for comment in cursor.fetchall():
+            comments_by_report[comment['report_id']].append(comment)
+    
+    return comments_by_report
+
+# Columns of the reports table, and the columns behind the nested objects
+REPORT_COLUMNS = (
+    'id', 'category', 'title', 'description', 'urgency_level', 'latitude', 'longitude',
+    'address', 'landmark', 'ward', 'contact_email', 'contact_phone', 'status',
+    'image_paths', 'upvotes', 'comments_count', 'created_at', 'updated_at', 'resolved_at'
+)
+REPORT_FIELD_COLUMNS = {
+    'location': ('latitude', 'longitude', 'address', 'landmark', 'ward'),
+    'contact': ('contact_email', 'contact_phone')
+}
+
+def parse_report_fields(value, extra_fields=()):
+    """Validate a fields= selection given as a comma-separated string or a list.
+    
+    Returns None when no selection was made, meaning every field.
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+    fields = tuple(dict.fromkeys(str(field).strip() for field in value if str(field).strip()))
+    unknown = [
+        field for field in fields
+        if field not in REPORT_COLUMNS and field not in REPORT_FIELD_COLUMNS and field not in extra_fields
+    ]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields or None
+
+def report_select_list(fields, required_columns=()):
+    """SQL select list covering the requested fields and any columns the caller needs"""
+    if fields is None:
+        return 'reports.*'
+    columns = []
+    for field in (*required_columns, *fields):
+        for column in REPORT_FIELD_COLUMNS.get(field, (field,)):
+            if column in REPORT_COLUMNS and column not in columns:
+                columns.append(column)
+    return ', '.join(f'reports.{column}' for column in columns)
+
+@lru_cache(maxsize=64)
+def compile_report_serializer(columns, fields=None):
+    """Build a serializer for tuple rows with these columns.
+    
+    Produces the same shape as serialize_report(), but resolves column
+    positions once per result set instead of once per row. With fields,
+    only those keys are emitted and unrequested nested objects are skipped.
+    """
+    index = {name: position for position, name in enumerate(columns)}
+    latitude, longitude = index.get('latitude'), index.get('longitude')
+    address, landmark, ward = index.get('address'), index.get('landmark'), index.get('ward')
+    email, phone = index.get('contact_email'), index.get('contact_phone')
+    image_paths = index.get('image_paths')
+    has_location = latitude is not None and longitude is not None
+    
+    if fields is None:
+        plain_fields = None
+        want_image_paths = True
+    else:
+        plain_fields = tuple((name, index[name]) for name in fields if name in index and name != 'image_paths')
+        want_image_paths = 'image_paths' in fields
+        has_location = has_location and 'location' in fields
+        email = email if 'contact' in fields else None
+    
+    def serialize(row):
+        if plain_fields is None:
+            report = dict(zip(columns, row))
+        else:
+            report = {name: row[position] for name, position in plain_fields}
+        if want_image_paths:
+            report['image_paths'] = parse_image_paths(row[image_paths]) if image_paths is not None else []
+        if has_location:
+            report['location'] = {
+                'latitude': float(row[latitude] or 0),
+                'longitude': float(row[longitude] or 0),
+                'address': row[address] if address is not None else '',
+                'landmark': row[landmark] if landmark is not None else '',
+                'ward': row[ward] if ward is not None else ''
+            }
+        if email is not None:
+            report['contact'] = {
+                'email': row[email],
+                'phone': row[phone] if phone is not None else ''
+            }
+        return report
+    
+    return serialize
+
+def encode_json(payload):
+    """Encode to JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+def json_response(payload, status=200):
+    """Like jsonify(), but encoded with encode_json()"""
+    return app.response_class(encode_json(payload), status=status, mimetype='application/json')
+
+# Response compression
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html'}
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+def negotiate_encoding(available):
+    """Pick the best of the available content codings the client accepts"""
+    accepted = request.accept_encodings
+    choices = [(accepted.quality(coding), coding) for coding in available if accepted.quality(coding) > 0]
+    return max(choices, key=lambda choice: choice[0])[1] if choices else None
+
+@app.after_request
+def compress_response(response):
+    """gzip or brotli encode JSON and HTML bodies above COMPRESS_MIN_SIZE"""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < app.config["COMPRESS_MIN_SIZE"]:
+        return response
+    
+    encoding = negotiate_encoding(('br', 'gzip') if brotli is not None else ('gzip',))
+    if encoding == 'br':
+        response.set_data(brotli.compress(body, quality=BROTLI_QUALITY))
+    elif encoding == 'gzip':
+        response.set_data(gzip.compress(body, compresslevel=GZIP_LEVEL))
+    else:
+        return response
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+# Static assets. `flask build-assets` writes content-hashed, precompressed
+# copies under static/dist/ and a manifest that url_for('static') consults.
+ASSET_SOURCE_DIRS = ('css', 'js')
+ASSET_DIST_DIR = 'dist'
+ASSET_HASH_LENGTH = 12
+ASSET_MAX_AGE = 365 * 24 * 3600
+PRECOMPRESSED_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+def asset_manifest_path():
+    return os.path.join(app.static_folder, ASSET_DIST_DIR, 'manifest.json')
+
+@lru_cache(maxsize=1)
+def asset_manifest():
+    """Source path -> hashed dist path, empty until build-assets has run"""
+    try:
+        with open(asset_manifest_path()) as manifest_file:
+            return json.load(manifest_file)
+    except FileNotFoundError:
+        return {}
+
+@app.url_defaults
+def hashed_static_url(endpoint, values):
+    """Point url_for('static', filename=...) at the hashed build when there is one"""
+    if endpoint == 'static' and 'filename' in values:
+        values['filename'] = asset_manifest().get(values['filename'], values['filename'])
+
+def serve_static(filename):
+    """Static files, with precompressed variants and immutable caching for hashed builds"""
+    if not filename.startswith(ASSET_DIST_DIR + '/'):
+        return app.send_static_file(filename)
+    
+    available = [
+        coding for coding, suffix in PRECOMPRESSED_SUFFIXES.items()
+        if os.path.isfile(os.path.join(app.static_folder, filename + suffix))
+    ]
+    encoding = negotiate_encoding(available)
+    if encoding is None:
+        response = send_from_directory(app.static_folder, filename, max_age=ASSET_MAX_AGE)
+    else:
+        response = send_from_directory(
+            app.static_folder, filename + PRECOMPRESSED_SUFFIXES[encoding],
+            mimetype=mimetypes.guess_type(filename)[0], max_age=ASSET_MAX_AGE
+        )
+        response.headers['Content-Encoding'] = encoding
+    
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+app.view_functions['static'] = serve_static
+
+# Keyset pagination over (created_at, id). Cursors are opaque to clients.
+MAX_PAGE_SIZE = 100
+
+def parse_page_size(value):
+    """Parse a page size query argument, capped at MAX_PAGE_SIZE"""
+    size = int(value)
+    if size < 1:
+        raise ValueError('page size must be a positive integer')
+    return min(size, MAX_PAGE_SIZE)
+
+def encode_page_cursor(report):
+    """Build the opaque cursor that resumes after the given report"""
+    payload = json.dumps([report['created_at'], report['id']]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+def decode_page_cursor(page_cursor):
+    """Return the (created_at, id) pair encoded in a cursor"""
+    try:
+        padded = page_cursor + '=' * (-len(page_cursor) % 4)
+        created_at, report_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return str(created_at), str(report_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+REPORT_BY_ID_SQL = 'SELECT * FROM reports WHERE id = ?'
+
+REPORT_PAGE_AFTER_SQL = '''
+    SELECT {select} FROM reports 
+    WHERE (created_at, id) < (?, ?)
+    ORDER BY created_at DESC, id DESC 
+    LIMIT ?
+'''
+REPORT_PAGE_OFFSET_SQL = '''
+    SELECT {select} FROM reports 
+    ORDER BY created_at DESC, id DESC 
+    LIMIT ? OFFSET ?
+'''
+
+def fetch_report_page(cursor, page_cursor, limit, select='*', offset=0):
+    """Fetch one page of tuple rows, newest first, plus the cursor for the next page.
+    
+    select must include the id and created_at columns.
+    """
+    if page_cursor:
+        created_at, report_id = decode_page_cursor(page_cursor)
+        cursor.execute(REPORT_PAGE_AFTER_SQL.format(select=select), (created_at, report_id, limit + 1))
+    else:
+        # Plain offsets are kept for page= clients, but cost grows with the offset
+        cursor.execute(REPORT_PAGE_OFFSET_SQL.format(select=select), (limit + 1, offset))
+    reports = cursor.fetchall()
+    
+    next_cursor = None
+    if len(reports) > limit:
+        reports = reports[:limit]
+        next_cursor = encode_page_cursor(dict(zip(column_names(cursor), reports[-1])))
+    return reports, next_cursor
+
+# Report counters shared by the stats, dashboard and health endpoints
+REPORT_STATS_SQL = '''
+    SELECT 
+        COALESCE(SUM(count), 0) as total,
+        COALESCE(SUM(CASE WHEN value = 'submitted' THEN count END), 0) as submitted,
+        COALESCE(SUM(CASE WHEN value = 'in-progress' THEN count END), 0) as in_progress,
+        COALESCE(SUM(CASE WHEN value = 'resolved' THEN count END), 0) as resolved,
+        (SELECT COUNT(*) FROM report_counters 
+         WHERE dimension = 'contact_email' AND count > 0) as users,
+        (SELECT COUNT(*) FROM whatsapp_groups) as groups,
+        (SELECT COUNT(*) FROM forum_posts) as posts,
+        (SELECT version FROM data_versions WHERE scope = 'reports') as reports_version,
+        (SELECT version FROM data_versions WHERE scope = 'community') as community_version
+    FROM report_counters 
+    WHERE dimension = 'status'
+'''
+
+class StatsService:
+    """Computes all report counters in one query and caches them per data version"""
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._stats = None
+        self._versions = None
+    
+    def get(self):
+        """Return the cached counters, recomputing them once a write bumps a data version"""
+        with database_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT version FROM data_versions WHERE scope IN ('reports', 'community') ORDER BY scope DESC"
+            )
+            versions = tuple(row[0] for row in cursor.fetchall())
+            with self._lock:
+                if self._stats is not None and self._versions == versions:
+                    self.hits += 1
+                    return self._stats
+                self.misses += 1
+            
+            # The versions are read in the same statement as the counters, so
+            # the cached result always matches the ETag of the version it holds
+            cursor.execute(REPORT_STATS_SQL)
+            stats = dict(cursor.fetchone())
+        
+        versions = (stats.pop('reports_version'), stats.pop('community_version'))
+        with self._lock:
+            self._stats = stats
+            self._versions = versions
+        return stats
+    
+    def cache_info(self):
+        """Hit and miss counts since startup"""
+        return {'hits': self.hits, 'misses': self.misses}
+
+stats_service = StatsService()
+
+# In-process pub/sub for report change events
+class Subscription:
+    """One client's event queue and filters"""
+    
+    def __init__(self, report_ids, wards, categories, max_queue):
+        self.report_ids = report_ids
+        self.wards = wards
+        self.categories = categories
+        self.events = queue.Queue(maxsize=max_queue)
+        self.overflowed = False
+    
+    def matches(self, event):
+        """True if the event passes every filter the client set"""
+        return (
+            (not self.report_ids or event['report_id'] in self.report_ids)
+            and (not self.wards or event['ward'] in self.wards)
+            and (not self.categories or event['category'] in self.categories)
+        )
+
+class EventBroker:
+    """Fans report change events out to subscribed clients"""
+    
+    def __init__(self, history_size=1000, max_queue=100):
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+        self._history = collections.deque(maxlen=history_size)
+        self._next_id = 1
+    
+    def subscribe(self, report_ids=(), wards=(), categories=(), last_event_id=None, max_subscribers=None):
+        """Register a client, replaying buffered events newer than last_event_id.
+        
+        Returns None when max_subscribers clients are already registered.
+        """
+        subscription = Subscription(set(report_ids), set(wards), set(categories), self.max_queue)
+        with self._lock:
+            if max_subscribers is not None and len(self._subscriptions) >= max_subscribers:
+                return None
+            if last_event_id is not None:
+                for event in self._history:
+                    if event['id'] > last_event_id and subscription.matches(event):
+                        self._deliver(subscription, event)
+            self._subscriptions.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+    
+    def publish(self, event_type, report_id, ward=None, category=None, **data):
+        """Send an event to every matching subscriber"""
+        with self._lock:
+            event = {
+                'id': self._next_id,
+                'type': event_type,
+                'report_id': report_id,
+                'ward': ward,
+                'category': category,
+                'data': data
+            }
+            self._next_id += 1
+            self._history.append(event)
+            for subscription in self._subscriptions:
+                if subscription.matches(event):
+                    self._deliver(subscription, event)
+        return event
+    
+    def _deliver(self, subscription, event):
+        # A client that can't keep up is cut off and resumes via Last-Event-ID
+        try:
+            subscription.events.put_nowait(event)
+        except queue.Full:
+            subscription.overflowed = True
+    
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscriptions)
+
+event_broker = EventBroker()
+
+# Conditional GET support
+def get_data_version(scope):
+    """Current change counter for a group of tables"""
+    with database_connection() as conn:
+        row = conn.execute('SELECT version FROM data_versions WHERE scope = ?', (scope,)).fetchone()
+    return row[0] if row else 0
+
+def conditional_get(scope):
+    """Tag GET responses with the scope's data version and answer 304 when unchanged"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+            
+            etag = f"{scope}-{get_data_version(scope)}"
+            if request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+            else:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
 # Sample data initialization
 def initialize_sample_data():
     """Initialize database with sample data"""
@@ -255,9 +1344,6 @@ def initialize_sample_data():
             conn.commit()
             print("✅ Sample data initialized successfully")
 
-# Initialize sample data
-initialize_sample_data()
-
 # Routes
 @app.route('/')
 def home():
@@ -269,7 +1355,7 @@ def report():
 
 @app.route('/track')
 def track():
-    return render_template('track.html')
+    return render_template('track.html', live_updates=app.config["SSE_ENABLED"])
 
 @app.route('/viewmap')
 def viewmap():
@@ -292,26 +1378,13 @@ def admin_login_page():
 def dashboard():
     """Show admin dashboard (protected)"""
     # Get admin stats
-    with database_connection() as conn:
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) FROM reports")
-        total_reports = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM reports WHERE status = 'submitted'")
-        pending_reports = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM reports WHERE status = 'resolved'")
-        resolved_reports = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(DISTINCT contact_email) FROM reports")
-        total_users = cursor.fetchone()[0]
+    stats = stats_service.get()
     
     return render_template('dashboard.html', 
-                         total_reports=total_reports,
-                         pending_reports=pending_reports,
-                         resolved_reports=resolved_reports,
-                         total_users=total_users)
+                         total_reports=stats['total'],
+                         pending_reports=stats['submitted'],
+                         resolved_reports=stats['resolved'],
+                         total_users=stats['users'])
 
 # Admin Authentication Routes
 @app.route('/admin/login', methods=['POST'])
@@ -363,24 +1436,34 @@ def admin_logout():
 
 # Admin API endpoints
 @app.route('/api/admin/reports')
+@conditional_get('reports')
 def get_admin_reports():
-    """Get all reports for admin panel"""
+    """Get a page of reports for admin panel"""
     try:
+        limit = parse_page_size(request.args.get('limit', 50))
+        page_cursor = request.args.get('cursor')
+        # The admin panel gets the flat columns, without location/contact objects
+        fields = parse_report_fields(request.args.get('fields')) or REPORT_COLUMNS
+        
         with database_connection() as conn:
-            conn.row_factory = dict_factory
+            conn.row_factory = None
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM reports 
-                ORDER BY created_at DESC
-            ''')
-            reports = cursor.fetchall()
+            rows, next_cursor = fetch_report_page(
+                cursor, page_cursor, limit, report_select_list(fields, ('id', 'created_at'))
+            )
+            total = stats_service.get()['total']
             
-            # Convert JSON strings
-            for report in reports:
-                if report.get('image_paths'):
-                    report['image_paths'] = json.loads(report['image_paths'])
+            serialize = compile_report_serializer(column_names(cursor), fields)
+            reports = [serialize(row) for row in rows]
             
-        return jsonify({'success': True, 'reports': reports})
+        return jsonify({
+            'success': True,
+            'reports': reports,
+            'next_cursor': next_cursor,
+            'total': total
+        })
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -406,12 +1489,28 @@ def update_report_status_admin(report_id):
                 return jsonify({'success': False, 'message': 'Report not found'}), 404
             
             conn.commit()
+            
+            cursor.execute("SELECT ward, category FROM reports WHERE id = ?", (report_id,))
+            report = cursor.fetchone()
+        
+        event_broker.publish('status', report_id, report['ward'], report['category'], status=new_status)
 
         return jsonify({'success': True, 'message': 'Status updated successfully'})
 
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error updating status: {str(e)}'}), 500
 
+ADMIN_USERS_SQL = '''
+    SELECT 
+        contact_email as email,
+        COUNT(*) as report_count,
+        MAX(created_at) as last_activity,
+        MIN(created_at) as joined_date
+    FROM reports 
+    GROUP BY contact_email
+    ORDER BY last_activity DESC
+'''
+
 @app.route('/api/admin/users')
 def get_admin_users():
     """Get all users for admin panel"""
@@ -419,93 +1518,103 @@ def get_admin_users():
         with database_connection() as conn:
             conn.row_factory = dict_factory
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT 
-                    contact_email as email,
-                    COUNT(*) as report_count,
-                    MAX(created_at) as last_activity,
-                    MIN(created_at) as joined_date
-                FROM reports 
-                GROUP BY contact_email
-                ORDER BY last_activity DESC
-            ''')
+            cursor.execute(ADMIN_USERS_SQL)
             users = cursor.fetchall()
             
         return jsonify({'success': True, 'users': users})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
+# Analytics snapshot
+@lru_cache(maxsize=1)
+def load_analytics():
+    """Import the NumPy analytics module on first use, or None without NumPy"""
+    try:
+        import analytics
+    except ImportError:  # numpy is optional, /api/admin/analytics then serves counters only
+        return None
+    return analytics
+
+class AnalyticsSnapshotCache:
+    """Columnar reports snapshot reused until the reports data version changes.
+    
+    A new version only applies the rows written since the previous one, so
+    analytics stay cheap on a large table that takes a steady trickle of writes.
+    """
+    
+    def __init__(self):
+        self.version = None
+        self.snapshot = None
+        self.builder = None
+        self._lock = threading.Lock()
+    
+    def get(self):
+        version = get_data_version('reports')
+        with self._lock:
+            if self.snapshot is None or self.version != version:
+                if self.builder is None:
+                    self.builder = load_analytics().SnapshotBuilder()
+                with database_connection() as conn:
+                    self.builder.sync(conn)
+                self.snapshot = self.builder.snapshot()
+                self.version = version
+            return self.snapshot
+
+analytics_snapshots = AnalyticsSnapshotCache()
+
+COUNTER_ROWS_SQL = '''
+    SELECT value as {label}, count 
+    FROM report_counters 
+    WHERE dimension = ? AND count > 0 AND value != ''
+    ORDER BY count DESC 
+    LIMIT ?
+'''
+RECENT_ACTIVITY_SQL = '''
+    SELECT value as date, count as report_count 
+    FROM report_counters 
+    WHERE dimension = 'day' AND count > 0 AND value >= DATE('now', '-7 days')
+    ORDER BY value
+'''
+
 @app.route('/api/admin/analytics')
+@conditional_get('reports')
 def get_admin_analytics():
     """Get analytics data for admin panel"""
     try:
         with database_connection() as conn:
             cursor = conn.cursor()
             
-            # Category distribution
-            cursor.execute('''
-                SELECT category, COUNT(*) as count 
-                FROM reports 
-                GROUP BY category 
-                ORDER BY count DESC
-            ''')
-            category_stats = cursor.fetchall()
+            # Distributions come from the trigger-maintained report_counters
+            def counter_rows(dimension, label, limit=-1):
+                cursor.execute(COUNTER_ROWS_SQL.format(label=label), (dimension, limit))
+                return cursor.fetchall()
             
-            # Status distribution
-            cursor.execute('''
-                SELECT status, COUNT(*) as count 
-                FROM reports 
-                GROUP BY status 
-                ORDER BY count DESC
-            ''')
-            status_stats = cursor.fetchall()
-            
-            # Urgency distribution
-            cursor.execute('''
-                SELECT urgency_level, COUNT(*) as count 
-                FROM reports 
-                GROUP BY urgency_level 
-                ORDER BY count DESC
-            ''')
-            urgency_stats = cursor.fetchall()
+            category_stats = counter_rows('category', 'category')
+            status_stats = counter_rows('status', 'status')
+            urgency_stats = counter_rows('urgency_level', 'urgency_level')
+            ward_stats = counter_rows('ward', 'ward', 10)
             
             # Recent activity (last 7 days)
-            cursor.execute('''
-                SELECT 
-                    DATE(created_at) as date,
-                    COUNT(*) as report_count
-                FROM reports 
-                WHERE created_at >= DATE('now', '-7 days')
-                GROUP BY DATE(created_at)
-                ORDER BY date
-            ''')
+            cursor.execute(RECENT_ACTIVITY_SQL)
             recent_activity = cursor.fetchall()
-            
-            # Ward-wise distribution
-            cursor.execute('''
-                SELECT ward, COUNT(*) as count 
-                FROM reports 
-                WHERE ward IS NOT NULL AND ward != ''
-                GROUP BY ward 
-                ORDER BY count DESC
-                LIMIT 10
-            ''')
-            ward_stats = cursor.fetchall()
 
-        return jsonify({
-            'success': True,
-            'analytics': {
-                'categories': [dict(row) for row in category_stats],
-                'status': [dict(row) for row in status_stats],
-                'urgency': [dict(row) for row in urgency_stats],
-                'recent_activity': [dict(row) for row in recent_activity],
-                'wards': [dict(row) for row in ward_stats]
-            }
-        })
+        result = {
+            'categories': [dict(row) for row in category_stats],
+            'status': [dict(row) for row in status_stats],
+            'urgency': [dict(row) for row in urgency_stats],
+            'recent_activity': [dict(row) for row in recent_activity],
+            'wards': [dict(row) for row in ward_stats]
+        }
+        analytics = load_analytics()
+        if analytics is not None:
+            result.update(analytics.compute_analytics(analytics_snapshots.get()))
+        
+        return jsonify({'success': True, 'analytics': result})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
 @app.route('/api/admin/reports/<report_id>/details')
+@conditional_get('reports')
 def get_report_details(report_id):
     """Get detailed report information"""
     try:
@@ -514,23 +1623,15 @@ def get_report_details(report_id):
             cursor = conn.cursor()
             
             # Get report
-            cursor.execute('SELECT * FROM reports WHERE id = ?', (report_id,))
-            report = cursor.fetchone()
+            cursor.execute(REPORT_BY_ID_SQL, (report_id,))
+            report = cursor.fetchone() or find_queued_report(report_id)
             
             if not report:
                 return jsonify({'success': False, 'message': 'Report not found'}), 404
             
-            # Get comments
-            cursor.execute('''
-                SELECT * FROM report_comments 
-                WHERE report_id = ? 
-                ORDER BY created_at
-            ''', (report_id,))
-            comments = cursor.fetchall()
-            
             # Serialize report
             serialized_report = serialize_report(report)
-            serialized_report['comments'] = [dict(comment) for comment in comments]
+            serialized_report['comments'] = load_report_comments(cursor, [report_id])[report_id]
 
         return jsonify({'success': True, 'report': serialized_report})
     except Exception as e:
@@ -543,6 +1644,9 @@ def delete_report(report_id):
         with database_connection() as conn:
             cursor = conn.cursor()
             
+            cursor.execute("SELECT ward, category FROM reports WHERE id = ?", (report_id,))
+            report = cursor.fetchone()
+            
             # Delete comments first (due to foreign key constraint)
             cursor.execute('DELETE FROM report_comments WHERE report_id = ?', (report_id,))
             
@@ -553,50 +1657,371 @@ def delete_report(report_id):
                 return jsonify({'success': False, 'message': 'Report not found'}), 404
             
             conn.commit()
+        
+        event_broker.publish('deleted', report_id, report['ward'], report['category'])
 
         return jsonify({'success': True, 'message': 'Report deleted successfully'})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
+# Report submission helpers shared by single and bulk submission
+REQUIRED_REPORT_FIELDS = ['category', 'title', 'description', 'urgency_level', 'latitude', 'longitude', 'address', 'contact_email']
+
+REPORT_INSERT_SQL = '''
+    INSERT INTO reports (id, category, title, description, urgency_level, 
+    latitude, longitude, address, landmark, ward, contact_email, contact_phone, image_paths)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def validate_report_payload(data):
+    """Return an error message for an invalid submission, or None"""
+    if not isinstance(data, dict):
+        return 'Report must be a JSON object'
+    for field in REQUIRED_REPORT_FIELDS:
+        if not data.get(field):
+            return f'Missing required field: {field}'
+    try:
+        latitude, longitude = float(data['latitude']), float(data['longitude'])
+    except (TypeError, ValueError):
+        return 'latitude and longitude must be numbers'
+    # NaN fails both comparisons, and infinities are out of range
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return 'latitude must be between -90 and 90 and longitude between -180 and 180'
+    image_paths = data.get('image_paths', [])
+    if not isinstance(image_paths, list) or not all(
+        isinstance(media_hash, str) and MEDIA_HASH_PATTERN.fullmatch(media_hash) for media_hash in image_paths
+    ):
+        return 'image_paths must be a list of media hashes returned by /api/media'
+    return None
+
+def unknown_media_hashes(cursor, hashes):
+    """The hashes that no upload to /api/media has stored, in the order given"""
+    known = set()
+    hashes = list(dict.fromkeys(hashes))
+    for start in range(0, len(hashes), ID_BATCH_SIZE):
+        chunk = hashes[start:start + ID_BATCH_SIZE]
+        placeholders = ','.join(['?'] * len(chunk))
+        cursor.execute(f"SELECT hash FROM media WHERE hash IN ({placeholders})", chunk)
+        known.update(row[0] for row in cursor.fetchall())
+    return [media_hash for media_hash in hashes if media_hash not in known]
+
+def unknown_media_errors(cursor, reports):
+    """Errors for validated reports whose image_paths name media never uploaded, by position.
+    
+    The hashes of all the reports are looked up together.
+    """
+    unknown = set(unknown_media_hashes(cursor, [
+        media_hash for data in reports for media_hash in data.get('image_paths', [])
+    ]))
+    errors = {}
+    for position, data in enumerate(reports):
+        missing = [media_hash for media_hash in data.get('image_paths', []) if media_hash in unknown]
+        if missing:
+            errors[position] = f'Unknown media hash in image_paths: {missing[0]}'
+    return errors
+
+def report_insert_values(report_id, data):
+    """Parameters for REPORT_INSERT_SQL"""
+    return (
+        report_id, 
+        data.get('category'), 
+        data.get('title'), 
+        data.get('description'),
+        data.get('urgency_level'), 
+        float(data.get('latitude')), 
+        float(data.get('longitude')),
+        data.get('address'), 
+        data.get('landmark', ''), 
+        data.get('ward', ''),
+        data.get('contact_email'), 
+        data.get('contact_phone', ''), 
+        json.dumps(data.get('image_paths', []))
+    )
+
+# Write-behind submission queue, enabled with WRITE_BEHIND=1
+QUEUED_REPORT_COLUMNS = (
+    'id', 'category', 'title', 'description', 'urgency_level', 'latitude', 'longitude',
+    'address', 'landmark', 'ward', 'contact_email', 'contact_phone', 'image_paths', 'created_at'
+)
+QUEUED_REPORT_INSERT_SQL = f'''
+    INSERT INTO reports ({', '.join(QUEUED_REPORT_COLUMNS)})
+    VALUES ({', '.join(['?'] * len(QUEUED_REPORT_COLUMNS))})
+    ON CONFLICT (id) DO NOTHING
+'''
+JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024
+
+def insert_report_rows(conn, sql, rows):
+    """Insert rows whose first value is the report id, in the open transaction.
+    
+    Returns (inserted ids, ids skipped by the ON CONFLICT clause, {id: error}).
+    The rows go in one executemany; if any of them is skipped or breaks a
+    constraint, that work is rolled back and redone a row at a time, so every
+    row's outcome is known and one bad row can't take the others with it.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.executemany(sql, rows)
+        if cursor.rowcount == len(rows):
+            return [row[0] for row in rows], [], {}
+    except sqlite3.IntegrityError:
+        pass
+    conn.rollback()
+    
+    inserted, skipped, failed = [], [], {}
+    for row in rows:
+        try:
+            cursor.execute(sql, row)
+        except sqlite3.IntegrityError as e:
+            failed[row[0]] = str(e)
+            continue
+        (inserted if cursor.rowcount else skipped).append(row[0])
+    return inserted, skipped, failed
+
+class ReportWriteQueue:
+    """Durable queue of accepted reports drained into SQLite by one writer thread.
+    
+    Each submission is appended to a journal file and fsynced before it is
+    acknowledged. The writer inserts whatever has accumulated in a single
+    transaction, so a burst costs one commit per batch instead of one per
+    report. Inserts skip ids that are already stored (ON CONFLICT DO NOTHING),
+    which makes replaying the journal after a crash safe even for rows that
+    were already committed.
+    
+    Every process writes its own journal, <base>.<pid>, and holds an
+    exclusive flock on it while it runs, so draining one queue never touches
+    entries another worker has acknowledged. On startup a queue adopts the
+    journals whose lock it can take, which belonged to processes that died
+    with reports still pending.
+    """
+    
+    def __init__(self, journal_base, batch_size=500, linger=0.02):
+        self.journal_base = journal_base
+        self.journal_path = f"{journal_base}.{os.getpid()}"
+        self.batch_size = batch_size
+        self.linger = linger
+        self.written = 0
+        self._pending = collections.OrderedDict()
+        self._condition = threading.Condition()
+        self._journal = self._open_locked(self.journal_path, blocking=False)
+        if self._journal is None:
+            raise RuntimeError(f"Write-behind journal {self.journal_path} is already open in this process")
+        self._recover()
+        self._writer = threading.Thread(target=self._run, name='report-writer', daemon=True)
+        self._writer.start()
+    
+    @staticmethod
+    def _open_locked(path, blocking=True):
+        """Open a journal for appending under an exclusive flock, or None if another process holds it"""
+        journal = open(path, 'a+', encoding='utf-8')
+        if fcntl is not None:
+            try:
+                fcntl.flock(journal.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                journal.close()
+                return None
+        return journal
+    
+    @staticmethod
+    def _read_entries(journal):
+        journal.seek(0)
+        entries = []
+        for line in journal:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue  # torn final line from a crash mid-append
+        return entries
+    
+    def _recover(self):
+        """Reload this process's journal and adopt the journals of dead processes"""
+        for values in self._read_entries(self._journal):
+            self._pending[values[0]] = values
+        
+        # The unsuffixed base is where queues wrote before journals were per process
+        orphans = [self.journal_base] + [
+            path for path in glob.glob(glob.escape(self.journal_base) + '.*')
+            if path.rsplit('.', 1)[1].isdigit() and path != self.journal_path
+        ]
+        for path in orphans if fcntl is not None else []:
+            try:
+                orphan = self._open_locked(path, blocking=False) if os.path.exists(path) else None
+            except OSError:
+                continue
+            if orphan is None:
+                continue  # its process is still running
+            try:
+                # Another adopter may have taken and removed it while we waited for the file
+                if os.fstat(orphan.fileno()).st_nlink == 0:
+                    continue
+                entries = self._read_entries(orphan)
+                if entries:
+                    self._journal.writelines(json.dumps(values) + '\n' for values in entries)
+                    self._journal.flush()
+                    os.fsync(self._journal.fileno())
+                    for values in entries:
+                        self._pending[values[0]] = values
+                os.remove(path)
+            finally:
+                orphan.close()
+        
+        if self._pending:
+            print(f"🛠️ Replaying {len(self._pending)} queued report(s) into {self.journal_path}")
+    
+    def enqueue(self, values):
+        """Durably record one row of QUEUED_REPORT_INSERT_SQL parameters"""
+        line = json.dumps(values) + '\n'
+        with self._condition:
+            self._journal.write(line)
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._pending[values[0]] = values
+            self._condition.notify()
+    
+    def get(self, report_id):
+        """The queued row for a report that has not been written yet, or None"""
+        with self._condition:
+            return self._pending.get(report_id)
+    
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been committed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+    
+    def queue_info(self):
+        """Pending and written counts since startup"""
+        with self._condition:
+            return {'pending': len(self._pending), 'written': self.written}
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+            
+            # Give a burst a moment to accumulate into the same transaction
+            time.sleep(self.linger)
+            with self._condition:
+                batch = list(itertools.islice(self._pending.values(), self.batch_size))
+            
+            try:
+                with database_connection() as conn:
+                    inserted, _, failed = insert_report_rows(conn, QUEUED_REPORT_INSERT_SQL, batch)
+                    conn.commit()
+            except Exception as e:
+                print(f"❌ Error writing queued reports, will retry: {str(e)}")
+                time.sleep(1)
+                continue
+            
+            # Validation keeps these out; a journal written by an older
+            # version could still hold one, and retrying it would block the queue
+            for report_id, error in failed.items():
+                print(f"❌ Dropping queued report {report_id}, it can't be stored: {error}")
+            
+            with self._condition:
+                for values in batch:
+                    self._pending.pop(values[0], None)
+                self.written += len(inserted)
+                self._compact()
+                self._condition.notify_all()
+            
+            inserted = set(inserted)
+            for values in batch:
+                row = dict(zip(QUEUED_REPORT_COLUMNS, values))
+                if row['id'] in inserted:
+                    event_broker.publish('report', row['id'], row['ward'], row['category'], status='submitted')
+    
+    def _compact(self):
+        """Drop committed entries from the journal. Called with the lock held."""
+        if not self._pending:
+            self._journal.truncate(0)
+            return
+        if os.fstat(self._journal.fileno()).st_size < JOURNAL_COMPACT_BYTES:
+            return
+        
+        # The replacement is locked before it takes the journal's name, so no
+        # starting process can mistake it for an orphan
+        temp_path = self.journal_path + '.tmp'
+        journal = self._open_locked(temp_path)
+        journal.truncate(0)
+        journal.writelines(json.dumps(values) + '\n' for values in self._pending.values())
+        journal.flush()
+        os.fsync(journal.fileno())
+        os.replace(temp_path, self.journal_path)
+        self._journal.close()
+        self._journal = journal
+
+_write_queue = None
+_write_queue_lock = threading.Lock()
+
+def get_report_write_queue():
+    """The write-behind queue, or None when WRITE_BEHIND is off"""
+    global _write_queue
+    if not app.config["WRITE_BEHIND"]:
+        return None
+    with _write_queue_lock:
+        if _write_queue is None:
+            _write_queue = ReportWriteQueue(
+                app.config["WRITE_BEHIND_JOURNAL"] or app.config["DATABASE"] + ".journal",
+                app.config["WRITE_BEHIND_BATCH_SIZE"],
+                app.config["WRITE_BEHIND_LINGER_MS"] / 1000
+            )
+        return _write_queue
+
+def find_queued_report(report_id):
+    """A not-yet-written report shaped like a reports row, or None"""
+    write_queue = get_report_write_queue()
+    values = write_queue.get(report_id) if write_queue is not None else None
+    if values is None:
+        return None
+    report = dict(zip(QUEUED_REPORT_COLUMNS, values))
+    report.update(
+        status='submitted', upvotes=0, comments_count=0, updated_at=report['created_at'], resolved_at=None, queued=True
+    )
+    return report
+
 # API Routes
 @app.route('/api/submit-report', methods=['POST'])
 def submit_report():
     try:
         data = request.get_json()
-        print(f"📨 Received report submission: {data}")
 
-        required_fields = ['category', 'title', 'description', 'urgency_level', 'latitude', 'longitude', 'address', 'contact_email']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({
-                    'success': False,
-                    'message': f'Missing required field: {field}'
-                }), 400
+        error = validate_report_payload(data)
+        if not error and data.get('image_paths'):
+            with database_connection() as conn:
+                error = unknown_media_errors(conn.cursor(), [data]).get(0)
+        if error:
+            return jsonify({
+                'success': False,
+                'message': error
+            }), 400
+        print(f"📨 Received report submission: {data.get('category')} in {data.get('ward') or 'unknown ward'}")
 
         report_id = str(uuid.uuid4())
         
+        write_queue = get_report_write_queue()
+        if write_queue is not None:
+            created_at = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+            write_queue.enqueue(list(report_insert_values(report_id, data)) + [created_at])
+            print(f"📥 Report queued with ID: {report_id}")
+            return jsonify({
+                'success': True,
+                'message': 'Report submitted successfully!',
+                'report_id': report_id,
+                'queued': True
+            }), 202
+        
         with database_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO reports (id, category, title, description, urgency_level, 
-                latitude, longitude, address, landmark, ward, contact_email, contact_phone, image_paths)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                report_id, 
-                data.get('category'), 
-                data.get('title'), 
-                data.get('description'),
-                data.get('urgency_level'), 
-                float(data.get('latitude')), 
-                float(data.get('longitude')),
-                data.get('address'), 
-                data.get('landmark', ''), 
-                data.get('ward', ''),
-                data.get('contact_email'), 
-                data.get('contact_phone', ''), 
-                json.dumps(data.get('image_paths', []))
-            ))
+            cursor.execute(REPORT_INSERT_SQL, report_insert_values(report_id, data))
             conn.commit()
+        
+        event_broker.publish('report', report_id, data.get('ward', ''), data.get('category'), status='submitted')
 
         print(f"✅ Report saved with ID: {report_id}")
         return jsonify({
@@ -612,40 +2037,153 @@ def submit_report():
             'message': f'Error submitting report: {str(e)}'
         }), 500
 
+BULK_BATCH_SIZE = 500
+BULK_REPORT_INSERT_SQL = REPORT_INSERT_SQL + "    ON CONFLICT (id) DO NOTHING\n"
+MAX_CLIENT_ID_LENGTH = 128
+
+def ingest_report_batch(cursor, batch, result):
+    """Validate and insert one batch of (index, report) pairs in a single transaction"""
+    valid = []
+    for index, data in batch:
+        error = validate_report_payload(data)
+        client_id = data.get('id') if isinstance(data, dict) else None
+        if not error and client_id is not None and (
+            not isinstance(client_id, str) or not client_id or len(client_id) > MAX_CLIENT_ID_LENGTH
+        ):
+            error = f'id must be a non-empty string of at most {MAX_CLIENT_ID_LENGTH} characters'
+        if error:
+            result['errors'].append({'index': index, 'message': error})
+        else:
+            valid.append((index, data))
+    
+    media_errors = unknown_media_errors(cursor, [data for _, data in valid])
+    rows = []
+    row_ids = []
+    for position, (index, data) in enumerate(valid):
+        if position in media_errors:
+            result['errors'].append({'index': index, 'message': media_errors[position]})
+            continue
+        rows.append(report_insert_values(data.get('id') or str(uuid.uuid4()), data))
+        row_ids.append((index, rows[-1][0]))
+    
+    if not rows:
+        return
+    
+    # Client-supplied ids make retries idempotent: known ids are skipped
+    existing = set()
+    ids = [report_id for _, report_id in row_ids]
+    for start in range(0, len(ids), ID_BATCH_SIZE):
+        chunk = ids[start:start + ID_BATCH_SIZE]
+        placeholders = ','.join(['?'] * len(chunk))
+        cursor.execute(f"SELECT id FROM reports WHERE id IN ({placeholders})", chunk)
+        existing.update(row[0] for row in cursor.fetchall())
+    
+    new_rows = []
+    for (_, report_id), row in zip(row_ids, rows):
+        if report_id in existing:
+            result['duplicates'].append(report_id)
+        else:
+            existing.add(report_id)
+            new_rows.append(row)
+    if not new_rows:
+        return
+    
+    # The conflict clause catches ids stored by a concurrent request since the lookup
+    inserted, skipped, failed = insert_report_rows(cursor.connection, BULK_REPORT_INSERT_SQL, new_rows)
+    result['inserted'].extend(inserted)
+    result['duplicates'].extend(skipped)
+    indexes = {report_id: index for index, report_id in row_ids}
+    for report_id, error in failed.items():
+        result['errors'].append({'index': indexes[report_id], 'message': error})
+
+def iter_bulk_payload():
+    """Yield (index, report) pairs from an NDJSON stream or a JSON array body"""
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        # request.stream is unbuffered, so line iteration would read byte by byte
+        for index, line in enumerate(io.BufferedReader(request.stream, 65536)):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield index, json.loads(line)
+            except ValueError:
+                yield index, None
+    else:
+        reports = request.get_json(silent=True)
+        if not isinstance(reports, list):
+            raise ValueError('Expected a JSON array of reports or an NDJSON body')
+        yield from enumerate(reports)
+
+@app.route('/api/reports/bulk', methods=['POST'])
+def bulk_submit_reports():
+    """Insert many reports in batched transactions, reporting per-row errors"""
+    result = {'inserted': [], 'duplicates': [], 'errors': []}
+    try:
+        with database_connection() as conn:
+            cursor = conn.cursor()
+            batch = []
+            for item in iter_bulk_payload():
+                batch.append(item)
+                if len(batch) >= BULK_BATCH_SIZE:
+                    ingest_report_batch(cursor, batch, result)
+                    conn.commit()
+                    batch = []
+            if batch:
+                ingest_report_batch(cursor, batch, result)
+                conn.commit()
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error ingesting reports: {str(e)}',
+            **result
+        }), 500
+    
+    return jsonify({
+        'success': True,
+        'inserted_count': len(result['inserted']),
+        'duplicate_count': len(result['duplicates']),
+        'error_count': len(result['errors']),
+        **result
+    })
+
 @app.route('/api/user-reports', methods=['GET'])
+@conditional_get('reports')
 def get_user_reports():
     try:
+        fields = parse_report_fields(request.args.get('fields'), extra_fields=('comments',))
+        include_comments = fields is None or 'comments' in fields
+        
         with database_connection() as conn:
-            conn.row_factory = dict_factory
+            conn.row_factory = None
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM reports 
+            cursor.execute(f'''
+                SELECT {report_select_list(fields, ('id',) if include_comments else ())} FROM reports 
                 ORDER BY created_at DESC
             ''')
-            reports = cursor.fetchall()
+            rows = cursor.fetchall()
             
             # Serialize each report
-            serialized_reports = []
-            for report in reports:
-                serialized_report = serialize_report(report)
-                
-                # Get comments for this report
-                cursor.execute('''
-                    SELECT * FROM report_comments 
-                    WHERE report_id = ? 
-                    ORDER BY created_at
-                ''', (serialized_report['id'],))
-                comments = cursor.fetchall()
-                serialized_report['comments'] = [dict(comment) for comment in comments]
-                
-                serialized_reports.append(serialized_report)
+            serialize = compile_report_serializer(column_names(cursor), fields)
+            serialized_reports = [serialize(report) for report in rows]
+            
+            if include_comments:
+                # Load comments for all reports in batched queries
+                id_position = column_names(cursor).index('id')
+                ids = [row[id_position] for row in rows]
+                comments_by_report = load_report_comments(cursor, ids)
+                for report_id, serialized_report in zip(ids, serialized_reports):
+                    serialized_report['comments'] = comments_by_report[report_id]
 
         print(f"📊 Returning {len(serialized_reports)} reports")
-        return jsonify({
+        return json_response({
             'success': True,
             'reports': serialized_reports
         })
 
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
         print(f"❌ Error fetching reports: {str(e)}")
         return jsonify({
@@ -658,72 +2196,122 @@ def get_filtered_reports():
     try:
         data = request.get_json()
         
-        query = "SELECT * FROM reports WHERE 1=1"
-        params = []
-        
-        if data.get('status') and len(data['status']) > 0:
-            placeholders = ','.join(['?'] * len(data['status']))
-            query += f" AND status IN ({placeholders})"
-            params.extend(data['status'])
-        
-        if data.get('categories') and len(data['categories']) > 0:
-            placeholders = ','.join(['?'] * len(data['categories']))
-            query += f" AND category IN ({placeholders})"
-            params.extend(data['categories'])
-        
-        if data.get('search'):
-            query += " AND (title LIKE ? OR description LIKE ? OR address LIKE ?)"
-            search_term = f"%{data['search']}%"
-            params.extend([search_term, search_term, search_term])
-        
-        query += " ORDER BY created_at DESC"
+        fields = parse_report_fields(data.get('fields') or request.args.get('fields'))
+        query, params = build_report_filter_query(
+            data.get('status'), data.get('categories'), data.get('search'),
+            report_select_list(fields)
+        )
         
         with database_connection() as conn:
-            conn.row_factory = dict_factory
+            conn.row_factory = None
             cursor = conn.cursor()
             cursor.execute(query, params)
-            filtered_reports = cursor.fetchall()
             
             # Serialize reports
-            serialized_reports = [serialize_report(report) for report in filtered_reports]
+            serialize = compile_report_serializer(column_names(cursor), fields)
+            serialized_reports = [serialize(report) for report in cursor.fetchall()]
 
-        return jsonify({
+        return json_response({
             'success': True,
             'reports': serialized_reports,
             'total': len(serialized_reports)
         })
 
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
         return jsonify({
             'success': False,
             'message': f'Error filtering reports: {str(e)}'
         }), 500
 
+# Streaming export
+EXPORT_BATCH_SIZE = 500
+EXPORT_CSV_COLUMNS = REPORT_COLUMNS
+
+def iter_report_batches(query, params):
+    """Yield (columns, rows) batches of tuple rows, holding only one batch in memory"""
+    with database_connection() as conn:
+        conn.row_factory = None
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        columns = column_names(cursor)
+        while True:
+            batch = cursor.fetchmany(EXPORT_BATCH_SIZE)
+            if not batch:
+                break
+            yield columns, batch
+
+def export_json_array(batches):
+    """Serialize batches as one JSON array, a chunk per batch"""
+    yield b'['
+    first = True
+    for columns, batch in batches:
+        serialize = compile_report_serializer(columns)
+        chunk = b','.join(encode_json(serialize(report)) for report in batch)
+        yield chunk if first else b',' + chunk
+        first = False
+    yield b']'
+
+def export_ndjson(batches):
+    """Serialize batches as newline-delimited JSON"""
+    for columns, batch in batches:
+        serialize = compile_report_serializer(columns)
+        yield b''.join(encode_json(serialize(report)) + b'\n' for report in batch)
+
+def export_csv(batches):
+    """Serialize batches as CSV rows with the raw report columns"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_CSV_COLUMNS)
+    yield buffer.getvalue()
+    for columns, batch in batches:
+        positions = [columns.index(column) for column in EXPORT_CSV_COLUMNS]
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([report[position] for position in positions] for report in batch)
+        yield buffer.getvalue()
+
+EXPORT_FORMATS = {
+    'json': (export_json_array, 'application/json', 'json'),
+    'ndjson': (export_ndjson, 'application/x-ndjson', 'ndjson'),
+    'csv': (export_csv, 'text/csv', 'csv')
+}
+
+@app.route('/api/reports/export', methods=['GET'])
+def export_reports():
+    """Stream reports as a JSON array, NDJSON or CSV with the /api/reports/filter filters"""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({
+            'success': False,
+            'message': f"Unsupported format: {export_format}. Use one of: {', '.join(EXPORT_FORMATS)}"
+        }), 400
+    
+    query, params = build_report_filter_query(
+        request.args.getlist('status'),
+        request.args.getlist('category'),
+        request.args.get('search')
+    )
+    
+    serializer, mimetype, extension = EXPORT_FORMATS[export_format]
+    return Response(serializer(iter_report_batches(query, params)), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename=reports.{extension}'
+    })
+
 @app.route('/api/reports/stats', methods=['GET'])
+@conditional_get('reports')
 def get_report_stats():
     try:
-        with database_connection() as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT COUNT(*) FROM reports WHERE status = 'submitted'")
-            submitted_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM reports WHERE status = 'in-progress'")
-            in_progress_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM reports WHERE status = 'resolved'")
-            resolved_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM reports")
-            total_count = cursor.fetchone()[0]
+        stats = stats_service.get()
 
         return jsonify({
             'success': True,
             'stats': {
-                'submitted': submitted_count,
-                'in_progress': in_progress_count,
-                'resolved': resolved_count,
-                'total': total_count
+                'submitted': stats['submitted'],
+                'in_progress': stats['in_progress'],
+                'resolved': stats['resolved'],
+                'total': stats['total']
             }
         })
 
@@ -743,8 +2331,9 @@ def add_comment(report_id):
             cursor = conn.cursor()
             
             # Check if report exists
-            cursor.execute("SELECT id FROM reports WHERE id = ?", (report_id,))
-            if not cursor.fetchone():
+            cursor.execute("SELECT id, ward, category FROM reports WHERE id = ?", (report_id,))
+            report = cursor.fetchone()
+            if not report:
                 return jsonify({'success': False, 'message': 'Report not found'}), 404
             
             # Insert comment
@@ -766,6 +2355,13 @@ def add_comment(report_id):
             ''', (report_id,))
             
             conn.commit()
+        
+        event_broker.publish(
+            'comment', report_id, report['ward'], report['category'],
+            comment_id=comment_id,
+            user_name=data.get('user_name', 'Anonymous'),
+            text=data.get('text')
+        )
 
         return jsonify({'success': True, 'message': 'Comment added successfully'})
 
@@ -793,6 +2389,11 @@ def update_report_status(report_id):
                 return jsonify({'success': False, 'message': 'Report not found'}), 404
             
             conn.commit()
+            
+            cursor.execute("SELECT ward, category FROM reports WHERE id = ?", (report_id,))
+            report = cursor.fetchone()
+        
+        event_broker.publish('status', report_id, report['ward'], report['category'], status=new_status)
 
         return jsonify({'success': True, 'message': 'Status updated successfully'})
 
@@ -800,74 +2401,608 @@ def update_report_status(report_id):
         return jsonify({'success': False, 'message': f'Error updating status: {str(e)}'}), 500
 
 @app.route('/api/reports', methods=['GET'])
+@conditional_get('reports')
 def get_reports():
     try:
         page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 10))
-        skip = (page - 1) * per_page
+        per_page = parse_page_size(request.args.get('per_page', 10))
+        page_cursor = request.args.get('cursor')
+        fields = parse_report_fields(request.args.get('fields'))
 
         with database_connection() as conn:
-            conn.row_factory = dict_factory
+            conn.row_factory = None
             cursor = conn.cursor()
             
-            # Get paginated reports
-            cursor.execute('''
-                SELECT * FROM reports 
-                ORDER BY created_at DESC 
-                LIMIT ? OFFSET ?
-            ''', (per_page, skip))
-            paginated_reports = cursor.fetchall()
-            
-            # Get total count
-            cursor.execute("SELECT COUNT(*) FROM reports")
-            total = cursor.fetchone()[0]
+            paginated_reports, next_cursor = fetch_report_page(
+                cursor, page_cursor, per_page,
+                report_select_list(fields, ('id', 'created_at')),
+                0 if page_cursor else max(page - 1, 0) * per_page
+            )
             
             # Serialize reports
-            serialized_reports = [serialize_report(report) for report in paginated_reports]
+            serialize = compile_report_serializer(column_names(cursor), fields)
+            serialized_reports = [serialize(report) for report in paginated_reports]
+            
+            # Total comes from the stats cache, which follows the reports data version
+            total = stats_service.get()['total']
 
         return jsonify({
             'success': True,
             'reports': serialized_reports,
             'total': total,
             'page': page,
-            'per_page': per_page
+            'per_page': per_page,
+            'next_cursor': next_cursor
         })
 
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error fetching reports: {str(e)}'}), 500
 
+# Timestamps have one-second resolution, so the changes feed only hands out
+# rows that are at least this old; later writes in the same second can't be
+# skipped by a cursor that has already moved past them.
+SYNC_SETTLE_SECONDS = 2
+MAX_SYNC_BATCH = 1000
+
+REPORT_CHANGES_SQL = '''
+    SELECT * FROM reports 
+    WHERE (updated_at, id) > (?, ?) AND updated_at < ?
+    ORDER BY updated_at, id 
+    LIMIT ?
+'''
+REPORT_TOMBSTONES_SQL = '''
+    SELECT id, deleted_at FROM report_tombstones 
+    WHERE (deleted_at, id) > (?, ?) AND deleted_at < ?
+    ORDER BY deleted_at, id 
+    LIMIT ?
+'''
+
+@app.route('/api/reports/changes', methods=['GET'])
+def get_report_changes():
+    """Reports created, updated or deleted since the client's sync cursor"""
+    try:
+        limit = int(request.args.get('limit', 200))
+        if limit < 1:
+            raise ValueError('limit must be a positive integer')
+        limit = min(limit, MAX_SYNC_BATCH)
+        since = request.args.get('since')
+        
+        with database_connection() as conn:
+            conn.row_factory = dict_factory
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT DATETIME('now', ?) as settled", (f'-{SYNC_SETTLE_SECONDS} seconds',))
+            settled = cursor.fetchone()['settled']
+            
+            if since:
+                try:
+                    padded = since + '=' * (-len(since) % 4)
+                    position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+                    updated_after = [str(value) for value in position['u']]
+                    deleted_after = [str(value) for value in position['d']]
+                except Exception:
+                    return jsonify({'success': False, 'message': 'Invalid sync cursor'}), 400
+            else:
+                # A first sync starts from an empty copy, so older deletes don't matter
+                updated_after = ['', '']
+                deleted_after = [settled, '']
+            
+            cursor.execute(REPORT_CHANGES_SQL, (updated_after[0], updated_after[1], settled, limit + 1))
+            changed_reports = cursor.fetchall()
+            
+            cursor.execute(REPORT_TOMBSTONES_SQL, (deleted_after[0], deleted_after[1], settled, limit + 1))
+            tombstones = cursor.fetchall()
+            
+            has_more = len(changed_reports) > limit or len(tombstones) > limit
+            changed_reports = changed_reports[:limit]
+            tombstones = tombstones[:limit]
+            
+            if changed_reports:
+                updated_after = [changed_reports[-1]['updated_at'], changed_reports[-1]['id']]
+            if tombstones:
+                deleted_after = [tombstones[-1]['deleted_at'], tombstones[-1]['id']]
+            
+            comments_by_report = load_report_comments(cursor, [report['id'] for report in changed_reports])
+            serialized_reports = []
+            for report in changed_reports:
+                serialized_report = serialize_report(report)
+                serialized_report['comments'] = comments_by_report[serialized_report['id']]
+                serialized_reports.append(serialized_report)
+        
+        next_cursor = base64.urlsafe_b64encode(
+            json.dumps({'u': updated_after, 'd': deleted_after}).encode()
+        ).decode().rstrip('=')
+        
+        return jsonify({
+            'success': True,
+            'reports': serialized_reports,
+            'deleted': [tombstone['id'] for tombstone in tombstones],
+            'next_cursor': next_cursor,
+            'has_more': has_more
+        })
+    
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error fetching report changes: {str(e)}'}), 500
+
+NEARBY_REPORTS_SQL = '''
+    SELECT reports.* FROM reports_rtree
+    JOIN reports ON reports.id = reports_rtree.report_id
+    WHERE reports_rtree.min_lat <= ? AND reports_rtree.max_lat >= ?
+    AND reports_rtree.min_lng <= ? AND reports_rtree.max_lng >= ?
+'''
+
+@app.route('/api/reports/nearby', methods=['GET'])
+@conditional_get('reports')
+def get_nearby_reports():
+    try:
+        try:
+            lat = float(request.args['lat'])
+            lng = float(request.args['lng'])
+            radius = min(float(request.args.get('radius', 2)), 50.0)
+            limit = min(int(request.args.get('limit', 20)), 100)
+        except (KeyError, ValueError):
+            return jsonify({'success': False, 'message': 'lat and lng must be valid numbers'}), 400
+        
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180) or radius <= 0 or limit <= 0:
+            return jsonify({'success': False, 'message': 'Invalid location or radius'}), 400
+        
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius)
+        
+        with database_connection() as conn:
+            conn.row_factory = dict_factory
+            cursor = conn.cursor()
+            
+            # Candidate reports from the spatial index
+            cursor.execute(NEARBY_REPORTS_SQL, (max_lat, min_lat, max_lng, min_lng))
+            candidates = cursor.fetchall()
+        
+        # Refine the bounding box with the exact distance
+        nearby_reports = []
+        for report in candidates:
+            distance = haversine_km(lat, lng, report['latitude'], report['longitude'])
+            if distance <= radius:
+                report['distance_km'] = round(distance, 3)
+                nearby_reports.append(report)
+        
+        nearby_reports.sort(key=lambda report: report['distance_km'])
+        serialized_reports = [serialize_report(report) for report in nearby_reports[:limit]]
+        
+        return jsonify({
+            'success': True,
+            'reports': serialized_reports,
+            'total': len(nearby_reports)
+        })
+    
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error fetching nearby reports: {str(e)}'}), 500
+
+# Map clustering on an equirectangular tile grid: at zoom z a tile spans
+# 360 / 2**z degrees on both axes and is split into CLUSTER_CELLS_PER_TILE
+# cells per side. Cells never straddle tiles, so results are cached per tile.
+CLUSTER_CELLS_PER_TILE = 4
+CLUSTER_POINT_ZOOM = 16
+MAX_MAP_ZOOM = 22
+MAX_TILES_PER_REQUEST = 256
+
+class TileCache:
+    """LRU cache of per-tile cluster results, keyed by data version"""
+    
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def cache_info(self):
+        """Hit and miss counts since startup"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+tile_cache = TileCache()
+
+def build_map_tile_query(zoom, tile_x, tile_y, statuses=None, categories=None):
+    """SQL and parameters for the reports inside one tile"""
+    tile_size = 360.0 / (2 ** zoom)
+    min_lng = tile_x * tile_size - 180.0
+    min_lat = tile_y * tile_size - 90.0
+    
+    # The R*Tree stores float32 boxes rounded outwards, so it only narrows the
+    # candidates; the half-open check on the real columns puts a point on or
+    # near an edge in exactly one tile
+    query = f'''
+        SELECT reports.id, reports.latitude, reports.longitude, reports.status, reports.category 
+        FROM reports_rtree 
+        JOIN reports ON reports.id = reports_rtree.report_id 
+        WHERE reports_rtree.max_lat >= ? AND reports_rtree.min_lat < ? 
+        AND reports_rtree.max_lng >= ? AND reports_rtree.min_lng < ?
+        AND reports.latitude >= ? AND reports.latitude < ? 
+        AND reports.longitude >= ? AND reports.longitude < ?
+    '''
+    max_lat, max_lng = min_lat + tile_size, min_lng + tile_size
+    # The last row and column also own the points lying on the 90/180 edge
+    if max_lat >= 90.0:
+        max_lat = math.inf
+    if max_lng >= 180.0:
+        max_lng = math.inf
+    bounds = [min_lat, max_lat, min_lng, max_lng]
+    params = bounds + bounds
+    if statuses:
+        query += f" AND reports.status IN ({','.join(['?'] * len(statuses))})"
+        params.extend(statuses)
+    if categories:
+        query += f" AND reports.category IN ({','.join(['?'] * len(categories))})"
+        params.extend(categories)
+    return query, params
+
+def load_map_tile(cursor, zoom, tile_x, tile_y, statuses, categories):
+    """Clusters (or individual points at high zoom) for one tile"""
+    cursor.execute(*build_map_tile_query(zoom, tile_x, tile_y, statuses, categories))
+    rows = cursor.fetchall()
+    
+    if zoom >= CLUSTER_POINT_ZOOM:
+        return [
+            {'id': row[0], 'latitude': row[1], 'longitude': row[2], 'status': row[3], 'category': row[4], 'count': 1}
+            for row in rows
+        ]
+    
+    cell_size = 360.0 / (2 ** zoom) / CLUSTER_CELLS_PER_TILE
+    cells = {}
+    for report_id, latitude, longitude, status, _ in rows:
+        key = (int((latitude + 90.0) // cell_size), int((longitude + 180.0) // cell_size))
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = {'count': 0, 'lat_sum': 0.0, 'lng_sum': 0.0, 'status': {}, 'id': report_id}
+        cell['count'] += 1
+        cell['lat_sum'] += latitude
+        cell['lng_sum'] += longitude
+        cell['status'][status] = cell['status'].get(status, 0) + 1
+    
+    clusters = []
+    for cell in cells.values():
+        cluster = {
+            'latitude': cell['lat_sum'] / cell['count'],
+            'longitude': cell['lng_sum'] / cell['count'],
+            'count': cell['count'],
+            'status': cell['status']
+        }
+        if cell['count'] == 1:
+            cluster['id'] = cell['id']
+        clusters.append(cluster)
+    return clusters
+
+@app.route('/api/map/clusters', methods=['GET'])
+@conditional_get('reports')
+def get_map_clusters():
+    """Pre-aggregated report clusters for a bounding box and zoom level"""
+    try:
+        try:
+            south, west, north, east = (float(value) for value in request.args['bbox'].split(','))
+            zoom = int(request.args.get('zoom', 13))
+        except (KeyError, ValueError):
+            return jsonify({'success': False, 'message': 'bbox must be south,west,north,east and zoom an integer'}), 400
+        
+        if not (-90 <= south <= north <= 90 and -180 <= west <= east <= 180) or not 0 <= zoom <= MAX_MAP_ZOOM:
+            return jsonify({'success': False, 'message': 'Invalid bounding box or zoom'}), 400
+        
+        tile_size = 360.0 / (2 ** zoom)
+        tile_columns = 2 ** zoom
+        tile_rows = max(2 ** zoom // 2, 1)
+        min_x, max_x = int((west + 180.0) // tile_size), min(int((east + 180.0) // tile_size), tile_columns - 1)
+        min_y, max_y = int((south + 90.0) // tile_size), min(int((north + 90.0) // tile_size), tile_rows - 1)
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > MAX_TILES_PER_REQUEST:
+            return jsonify({'success': False, 'message': 'Bounding box is too large for this zoom level'}), 400
+        
+        statuses = tuple(sorted(request.args.getlist('status')))
+        categories = tuple(sorted(request.args.getlist('category')))
+        version = get_data_version('reports')
+        
+        clusters = []
+        with database_connection() as conn:
+            cursor = conn.cursor()
+            for tile_x in range(min_x, max_x + 1):
+                for tile_y in range(min_y, max_y + 1):
+                    key = (version, zoom, tile_x, tile_y, statuses, categories)
+                    tile = tile_cache.get(key)
+                    if tile is None:
+                        tile = load_map_tile(cursor, zoom, tile_x, tile_y, statuses, categories)
+                        tile_cache.put(key, tile)
+                    clusters.extend(tile)
+        
+        # Whole tiles are cached, so trim to the requested box
+        clusters = [
+            cluster for cluster in clusters
+            if south <= cluster['latitude'] <= north and west <= cluster['longitude'] <= east
+        ]
+        
+        return json_response({
+            'success': True,
+            'zoom': zoom,
+            'points': zoom >= CLUSTER_POINT_ZOOM,
+            'clusters': clusters,
+            'total': sum(cluster['count'] for cluster in clusters)
+        })
+    
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error building map clusters: {str(e)}'}), 500
+
 @app.route('/api/reports/<report_id>', methods=['GET'])
+@conditional_get('reports')
 def get_report(report_id):
     try:
         with database_connection() as conn:
             conn.row_factory = dict_factory
             cursor = conn.cursor()
             
-            cursor.execute('SELECT * FROM reports WHERE id = ?', (report_id,))
-            report = cursor.fetchone()
+            cursor.execute(REPORT_BY_ID_SQL, (report_id,))
+            report = cursor.fetchone() or find_queued_report(report_id)
             
             if not report:
                 return jsonify({'success': False, 'message': 'Report not found'}), 404
             
             # Serialize report
             serialized_report = serialize_report(report)
-            
-            # Get comments
-            cursor.execute('''
-                SELECT * FROM report_comments 
-                WHERE report_id = ? 
-                ORDER BY created_at
-            ''', (report_id,))
-            comments = cursor.fetchall()
-            serialized_report['comments'] = [dict(comment) for comment in comments]
+            serialized_report['comments'] = load_report_comments(cursor, [report_id])[report_id]
 
         return jsonify({'success': True, 'report': serialized_report})
 
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error fetching report: {str(e)}'}), 500
 
+# Media uploads, stored by SHA-256 under MEDIA_ROOT/<first two hex digits>/<hash>
+MEDIA_CONTENT_TYPES = {
+    'image/jpeg', 'image/png', 'image/gif', 'image/webp',
+    'video/mp4', 'video/webm', 'video/quicktime'
+}
+MEDIA_HASH_PATTERN = re.compile(r'[0-9a-f]{64}')
+MAX_UPLOAD_FILES = 10
+THUMBNAIL_SIZE = (320, 320)
+MEDIA_MAX_AGE = 365 * 24 * 3600
+
+class MediaUpload:
+    """File part written straight to a temp file under MEDIA_ROOT, hashed as it streams in"""
+    
+    def __init__(self, max_bytes):
+        temp_dir = os.path.join(app.config["MEDIA_ROOT"], 'tmp')
+        os.makedirs(temp_dir, exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(dir=temp_dir)
+        self._file = os.fdopen(fd, 'w+b')
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.max_bytes = max_bytes
+    
+    def write(self, data):
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise RequestEntityTooLarge(f'Files are limited to {self.max_bytes} bytes')
+        self.sha256.update(data)
+        return self._file.write(data)
+    
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+    
+    def commit(self, path):
+        """Move the upload to path; False when identical content is already stored"""
+        self._file.close()
+        if os.path.exists(path):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(self.temp_path, path)
+        self.temp_path = None
+        return True
+    
+    def close(self):
+        self._file.close()
+        if self.temp_path and os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+class CityCareRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # Stream media uploads to disk instead of werkzeug's spooled temp file
+        if self.endpoint == 'upload_media':
+            # Counted here, so an extra part is refused before any of it is read
+            uploads = self.__dict__.setdefault('media_uploads', [])
+            if len(uploads) >= MAX_UPLOAD_FILES:
+                raise RequestEntityTooLarge(f'At most {MAX_UPLOAD_FILES} files per upload')
+            upload = MediaUpload(app.config["MEDIA_MAX_BYTES"])
+            uploads.append(upload)
+            return upload
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+    
+    def close(self):
+        # Parts abandoned mid-stream (e.g. over the size limit) never reach request.files
+        for upload in self.__dict__.get('media_uploads', ()):
+            upload.close()
+        super().close()
+
+app.request_class = CityCareRequest
+
+def media_path(media_hash, suffix=''):
+    return os.path.join(app.config["MEDIA_ROOT"], media_hash[:2], media_hash + suffix)
+
+_thumbnail_executor = None
+_thumbnail_executor_lock = threading.Lock()
+
+def get_thumbnail_executor():
+    """Worker pool that builds thumbnails off the request thread"""
+    global _thumbnail_executor
+    with _thumbnail_executor_lock:
+        if _thumbnail_executor is None:
+            _thumbnail_executor = ThreadPoolExecutor(
+                app.config["MEDIA_THUMBNAIL_WORKERS"], thread_name_prefix='thumbnail'
+            )
+        return _thumbnail_executor
+
+@lru_cache(maxsize=1)
+def load_pillow():
+    """Import Pillow on first use, or None when it is not installed"""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:  # optional, uploads are then stored without thumbnails
+        return None
+    return Image, ImageOps
+
+def build_thumbnail(media_hash):
+    """Write a JPEG thumbnail next to an uploaded image"""
+    Image, ImageOps = load_pillow()
+    target = media_path(media_hash, '.thumb.jpg')
+    if os.path.exists(target):
+        return
+    try:
+        with Image.open(media_path(media_hash)) as image:
+            thumbnail = ImageOps.exif_transpose(image).convert('RGB')
+            thumbnail.thumbnail(THUMBNAIL_SIZE)
+            temp_path = target + '.tmp'
+            thumbnail.save(temp_path, 'JPEG', quality=80, optimize=True)
+        os.replace(temp_path, target)
+    except Exception as e:
+        print(f"❌ Error building thumbnail for {media_hash}: {str(e)}")
+
+@app.route('/api/media', methods=['POST'])
+def upload_media():
+    """Store uploaded photos and videos, deduplicated by content hash"""
+    try:
+        uploads = request.files.getlist('files')
+        if not uploads:
+            return jsonify({'success': False, 'message': 'No files uploaded'}), 400
+        for upload in uploads:
+            if upload.mimetype not in MEDIA_CONTENT_TYPES:
+                return jsonify({'success': False, 'message': f'Unsupported media type: {upload.mimetype}'}), 415
+        
+        stored = []
+        with database_connection() as conn:
+            for upload in uploads:
+                media_hash = upload.stream.sha256.hexdigest()
+                created = upload.stream.commit(media_path(media_hash))
+                conn.execute(
+                    'INSERT OR IGNORE INTO media (hash, content_type, size) VALUES (?, ?, ?)',
+                    (media_hash, upload.mimetype, upload.stream.size)
+                )
+                has_thumbnail = upload.mimetype.startswith('image/') and load_pillow() is not None
+                if has_thumbnail:
+                    get_thumbnail_executor().submit(build_thumbnail, media_hash)
+                stored.append({
+                    'hash': media_hash,
+                    'content_type': upload.mimetype,
+                    'size': upload.stream.size,
+                    'duplicate': not created,
+                    'url': f'/media/{media_hash}',
+                    'thumbnail_url': f'/media/{media_hash}/thumbnail' if has_thumbnail else None
+                })
+            conn.commit()
+        
+        return jsonify({'success': True, 'media': stored})
+    except RequestEntityTooLarge as e:
+        return jsonify({'success': False, 'message': e.description}), 413
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error uploading media: {str(e)}'}), 500
+
+def send_media(media_hash, path, content_type):
+    """Send a stored file with range support and immutable caching"""
+    response = send_file(path, mimetype=content_type, conditional=True, etag=media_hash, max_age=MEDIA_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    return response
+
+def find_media(media_hash):
+    """The stored content type for a hash, or None"""
+    if not MEDIA_HASH_PATTERN.fullmatch(media_hash):
+        return None
+    with database_connection() as conn:
+        row = conn.execute('SELECT content_type FROM media WHERE hash = ?', (media_hash,)).fetchone()
+    return row[0] if row else None
+
+@app.route('/media/<media_hash>')
+def get_media(media_hash):
+    content_type = find_media(media_hash)
+    if content_type is None or not os.path.exists(media_path(media_hash)):
+        return jsonify({'success': False, 'message': 'Media not found'}), 404
+    return send_media(media_hash, media_path(media_hash), content_type)
+
+@app.route('/media/<media_hash>/thumbnail')
+def get_media_thumbnail(media_hash):
+    """Thumbnail of an image, 404 until the worker pool has built it"""
+    path = media_path(media_hash, '.thumb.jpg')
+    if find_media(media_hash) is None or not os.path.exists(path):
+        return jsonify({'success': False, 'message': 'Thumbnail not available'}), 404
+    return send_media(media_hash + '-thumb', path, 'image/jpeg')
+
+# Server-Sent Events
+SSE_HEARTBEAT_SECONDS = 15
+
+@app.route('/api/events')
+def report_events():
+    """Stream report change events, filtered by report_id, ward and category"""
+    if not app.config["SSE_ENABLED"]:
+        return jsonify({'success': False, 'message': 'Live updates are not enabled'}), 503
+    
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', request.args.get('last_event_id', '')))
+    except ValueError:
+        last_event_id = None
+    
+    subscription = event_broker.subscribe(
+        report_ids=request.args.getlist('report_id'),
+        wards=request.args.getlist('ward'),
+        categories=request.args.getlist('category'),
+        last_event_id=last_event_id,
+        max_subscribers=app.config["SSE_MAX_SUBSCRIBERS"]
+    )
+    if subscription is None:
+        # EventSource does not reconnect after an error status, so the page
+        # stays on its polling fallback
+        return jsonify({'success': False, 'message': 'Too many live update clients'}), 503
+    
+    # The generator only blocks on its own queue, so under a cooperative
+    # server (e.g. gunicorn -k gevent) idle clients cost a greenlet each,
+    # not an OS thread.
+    def stream():
+        try:
+            yield f"retry: {SSE_HEARTBEAT_SECONDS * 1000}\n\n"
+            while not subscription.overflowed:
+                try:
+                    event = subscription.events.get(timeout=SSE_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                payload = json.dumps({
+                    'report_id': event['report_id'],
+                    'ward': event['ward'],
+                    'category': event['category'],
+                    **event['data']
+                })
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+        finally:
+            event_broker.unsubscribe(subscription)
+    
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 # WhatsApp Groups API
 @app.route('/api/whatsapp-groups', methods=['GET', 'POST'])
+@conditional_get('community')
 def handle_whatsapp_groups():
     if request.method == 'GET':
         try:
@@ -903,18 +3038,21 @@ def handle_whatsapp_groups():
             return jsonify({'success': False, 'message': str(e)}), 500
 
 # Forum Posts API
+FORUM_POSTS_SQL = '''
+    SELECT * FROM forum_posts 
+    ORDER BY created_at DESC 
+    LIMIT 10
+'''
+
 @app.route('/api/forum-posts', methods=['GET', 'POST'])
+@conditional_get('community')
 def handle_forum_posts():
     if request.method == 'GET':
         try:
             with database_connection() as conn:
                 conn.row_factory = dict_factory
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT * FROM forum_posts 
-                    ORDER BY created_at DESC 
-                    LIMIT 10
-                ''')
+                cursor.execute(FORUM_POSTS_SQL)
                 posts = cursor.fetchall()
                 
             return jsonify({'success': True, 'posts': [dict(post) for post in posts]})
@@ -941,6 +3079,91 @@ def handle_forum_posts():
         except Exception as e:
             return jsonify({'success': False, 'message': str(e)}), 500
 
+# Chat retrieval
+CHAT_RESULT_LIMIT = 3
+
+CHAT_WARD_REPORTS_SQL = '''
+    SELECT id FROM reports WHERE ward = ? ORDER BY created_at DESC LIMIT ?
+'''
+CHAT_REPORTS_SQL = '''
+    SELECT id, title, category, status, ward, updated_at FROM reports WHERE id IN ({placeholders})
+'''
+CHAT_POSTS_SQL = '''
+    SELECT id, title, category, created_at FROM forum_posts WHERE id IN ({placeholders})
+'''
+
+@lru_cache(maxsize=1)
+def load_chat_search():
+    """Import the NumPy chat search module on first use, or None without NumPy"""
+    try:
+        import chat_search
+    except ImportError:  # numpy is optional, /api/chat then answers from its templates only
+        return None
+    return chat_search
+
+class ChatSearchIndexes:
+    """In-memory BM25 indexes over reports and forum posts, synced when their data version changes"""
+    
+    def __init__(self):
+        self.report_version = None
+        self.community_version = None
+        self.reports = None
+        self.posts = None
+        self._lock = threading.Lock()
+    
+    def search(self, terms, ward, limit):
+        """Ids of the best matching reports and forum posts"""
+        chat_search = load_chat_search()
+        report_version = get_data_version('reports')
+        community_version = get_data_version('community')
+        with self._lock:
+            if self.reports is None:
+                self.reports = chat_search.SearchIndex(chat_search.REPORTS_FEED)
+                self.posts = chat_search.SearchIndex(chat_search.FORUM_POSTS_FEED)
+            if report_version != self.report_version or community_version != self.community_version:
+                with database_connection() as conn:
+                    if report_version != self.report_version:
+                        self.reports.sync(conn)
+                    if community_version != self.community_version:
+                        self.posts.sync(conn)
+                self.report_version = report_version
+                self.community_version = community_version
+            return self.reports.search(terms, limit, ward), self.posts.search(terms, limit)
+
+chat_indexes = ChatSearchIndexes()
+
+def find_chat_matches(message, limit=CHAT_RESULT_LIMIT):
+    """The reports and forum posts most relevant to a chat message, best first"""
+    chat_search = load_chat_search()
+    if chat_search is None:
+        return [], []
+    terms, ward = chat_search.parse_question(message)
+    if not terms and not ward:
+        return [], []
+    
+    report_ids, post_ids = chat_indexes.search(terms, ward, limit)
+    with database_connection() as conn:
+        conn.row_factory = dict_factory
+        cursor = conn.cursor()
+        
+        # A question that only names a ward gets the ward's latest reports
+        if not terms:
+            cursor.execute(CHAT_WARD_REPORTS_SQL, (ward, limit))
+            report_ids = [row['id'] for row in cursor.fetchall()]
+        
+        # Status and titles are read fresh, the index only decides the order
+        def fetch(sql, ids):
+            if not ids:
+                return []
+            cursor.execute(sql.format(placeholders=','.join(['?'] * len(ids))), ids)
+            rows = {row['id']: row for row in cursor.fetchall()}
+            return [rows[row_id] for row_id in ids if row_id in rows]
+        
+        reports = fetch(CHAT_REPORTS_SQL, report_ids)
+        posts = fetch(CHAT_POSTS_SQL, post_ids)
+    
+    return reports, posts
+
 # Chat API Route
 @app.route('/api/chat', methods=['POST'])
 def chat_with_ai():
@@ -949,85 +3172,249 @@ def chat_with_ai():
         user_message = data.get('message', '')
         language = data.get('language', 'en')
 
-        response = generate_ai_response(user_message, language)
+        intent = chat_intents.classify(user_message)
+        reply = chat_intents.reply(intent, language)
+        
+        # Greetings and thanks get the canned reply without touching the database
+        reports, posts = [], []
+        if intent not in chat_intents.SMALL_TALK_INTENTS:
+            reports, posts = find_chat_matches(chat_intents.normalize_message(user_message))
+        
+        if reports or posts:
+            matches = chat_intents.describe_matches(reports, posts, language)
+            reply = matches if intent == chat_intents.FALLBACK_INTENT else f"{reply}\n\n{matches}"
 
         return jsonify({
             'success': True,
-            'reply': response
+            'reply': reply,
+            'intent': intent,
+            'reports': reports,
+            'posts': posts
         })
 
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error in chat: {str(e)}'}), 500
 
-def generate_ai_response(message, language):
-    message_lower = message.lower()
-
-    response_templates = {
-        'report': "I can help you report a civic issue! You can file a report directly through our system. The report page will guide you through the process step by step.",
-        'track': "You can track your reported issues in the tracking section. It shows the current status, updates, and estimated resolution time for each report.",
-        'pothole': "For pothole reports, please provide the exact location, size, and a photo if possible. This helps our teams address the issue quickly.",
-        'garbage': "Garbage collection schedules vary by area. You can check your area's schedule or report missed collections through our system.",
-        'water': "Water supply issues should be reported immediately. Please provide your location and nature of the problem for quick resolution.",
-        'tax': "Property tax payments can be made online through our portal. You'll need your property ID and can choose from multiple payment options.",
-        'hello': "Hello! I'm CityCare Assistant. I can help you report civic issues, track existing reports, find city services, and answer questions about local governance.",
-        'thanks': "You're welcome! I'm here to help anytime. Feel free to ask if you need assistance with any civic matters."
+# Query plan checks
+def query_plan_checks():
+    """Each route's SQL, built from the same constants and builders the route uses.
+    
+    `flask --app app check-query-plans` runs EXPLAIN QUERY PLAN on every entry and
+    fails if any of them still needs a full table scan.
+    """
+    sample_ids = ('report-1', 'report-2')
+    placeholders = ','.join(['?'] * len(sample_ids))
+    window = ('2024-01-01 00:00:00', '', '2100-01-01 00:00:00', 201)
+    checks = {
+        'user_reports': build_report_filter_query(),
+        'report_by_id': (REPORT_BY_ID_SQL, ('report-1',)),
+        'report_comments': (REPORT_COMMENTS_SQL.format(placeholders=placeholders), sample_ids),
+        'filter_reports': build_report_filter_query(['submitted'], ['Road Issues'], select='*'),
+        'search_reports': build_report_filter_query(['submitted'], search='water'),
+        'paginated_reports': (
+            REPORT_PAGE_AFTER_SQL.format(select='*'), ('2100-01-01 00:00:00', 'report-1', 11)
+        ),
+        'report_changes': (REPORT_CHANGES_SQL, window),
+        'report_tombstones': (REPORT_TOMBSTONES_SQL, window),
+        'stats': (REPORT_STATS_SQL, ()),
+        'admin_users': (ADMIN_USERS_SQL, ()),
+        'analytics_counters': (COUNTER_ROWS_SQL.format(label='category'), ('category', -1)),
+        'analytics_recent_activity': (RECENT_ACTIVITY_SQL, ()),
+        'nearby_reports': (NEARBY_REPORTS_SQL, (20.62, 20.58, 78.98, 78.94)),
+        'map_tile': build_map_tile_query(10, 736, 314, ['submitted'], ['Road Issues']),
+        'chat_ward_reports': (CHAT_WARD_REPORTS_SQL, ('Ward 5', CHAT_RESULT_LIMIT)),
+        'chat_reports': (CHAT_REPORTS_SQL.format(placeholders=placeholders), sample_ids),
+        'chat_posts': (CHAT_POSTS_SQL.format(placeholders=placeholders), sample_ids),
+        'forum_posts': (FORUM_POSTS_SQL, ())
     }
+    
+    analytics = load_analytics()
+    if analytics is not None:
+        checks['analytics_snapshot_changes'] = (analytics.SNAPSHOT_CHANGES_SELECT, ('2024-01-01 00:00:00',))
+        checks['analytics_snapshot_deletes'] = (analytics.TOMBSTONES_SELECT, ('2024-01-01 00:00:00',))
+    return checks
+
+def find_full_scans(cursor, sql, params):
+    """Return the query plan steps that scan a whole table without an index"""
+    cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+    return [
+        row[3] for row in cursor.fetchall()
+        if row[3].startswith('SCAN ') and 'INDEX' not in row[3]
+    ]
+
+def migrate_database():
+    """Create the tables and apply pending migrations on the configured database"""
+    pool = ConnectionPool(app.config["DATABASE"], 1)
+    conn = pool.acquire()
+    try:
+        init_db(conn)
+    finally:
+        pool.release(conn)
+        pool.close_all()
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create the tables and apply pending migrations"""
+    migrate_database()
+    print("✅ Database schema is up to date")
+
+@app.cli.command('seed')
+def seed_command():
+    """Migrate the database and load the sample reports, groups and posts if it is empty"""
+    migrate_database()
+    initialize_sample_data()
+
+@app.cli.command('check-query-plans')
+def check_query_plans():
+    """Fail if any route query needs a full table scan"""
+    failures = 0
+    with database_connection() as conn:
+        cursor = conn.cursor()
+        for name, (sql, params) in query_plan_checks().items():
+            full_scans = find_full_scans(cursor, sql, params)
+            if full_scans:
+                failures += 1
+                print(f"❌ {name}: {'; '.join(full_scans)}")
+            else:
+                print(f"✅ {name}")
+    
+    if failures:
+        raise SystemExit(1)
 
-    for keyword, response in response_templates.items():
-        if keyword in message_lower:
-            return response
+def rebuild_report_counters(conn):
+    """Recompute report_counters from reports and return the rows that drifted"""
+    cursor = conn.cursor()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        cursor.execute("SELECT dimension, value, count FROM report_counters WHERE count != 0")
+        stored = {(row[0], row[1]): row[2] for row in cursor.fetchall()}
+        
+        cursor.execute("DELETE FROM report_counters")
+        for statement in report_counter_backfill_statements():
+            cursor.execute(statement)
+        
+        cursor.execute("SELECT dimension, value, count FROM report_counters")
+        rebuilt = {(row[0], row[1]): row[2] for row in cursor.fetchall()}
+        drift = [
+            (dimension, value, stored.get((dimension, value), 0), rebuilt.get((dimension, value), 0))
+            for dimension, value in sorted(stored.keys() | rebuilt.keys())
+            if stored.get((dimension, value), 0) != rebuilt.get((dimension, value), 0)
+        ]
+        
+        # Corrected counters are new data for ETags and the stats cache
+        if drift:
+            cursor.execute("UPDATE data_versions SET version = version + 1 WHERE scope = 'reports'")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    
+    return drift
 
-    return "I understand you're asking about civic matters. I can help you with reporting issues, tracking reports, finding city services, or answering questions about local governance. What would you like to know more about?"
+@app.cli.command('check-counters')
+def check_counters():
+    """Rebuild report_counters and report any drift from the reports table"""
+    with database_connection() as conn:
+        drift = rebuild_report_counters(conn)
+    
+    for dimension, value, stored, actual in drift:
+        print(f"❌ {dimension}={value!r}: counter {stored}, actual {actual}")
+    
+    if drift:
+        print(f"🛠️ Rebuilt report counters, {len(drift)} value(s) had drifted")
+        raise SystemExit(1)
+    print("✅ Report counters are consistent")
+
+@app.cli.command('build-assets')
+def build_assets():
+    """Write content-hashed, gzip and brotli precompressed copies of static assets"""
+    manifest = {}
+    for directory in ASSET_SOURCE_DIRS:
+        source_dir = os.path.join(app.static_folder, directory)
+        target_dir = os.path.join(app.static_folder, ASSET_DIST_DIR, directory)
+        os.makedirs(target_dir, exist_ok=True)
+        
+        for name in sorted(os.listdir(source_dir)):
+            with open(os.path.join(source_dir, name), 'rb') as source:
+                body = source.read()
+            stem, extension = os.path.splitext(name)
+            digest = hashlib.sha256(body).hexdigest()[:ASSET_HASH_LENGTH]
+            hashed_name = f"{stem}.{digest}{extension}"
+            target = os.path.join(target_dir, hashed_name)
+            
+            with open(target, 'wb') as output:
+                output.write(body)
+            with open(target + PRECOMPRESSED_SUFFIXES['gzip'], 'wb') as output:
+                output.write(gzip.compress(body, compresslevel=9, mtime=0))
+            if brotli is not None:
+                with open(target + PRECOMPRESSED_SUFFIXES['br'], 'wb') as output:
+                    output.write(brotli.compress(body, quality=11))
+            
+            manifest[f"{directory}/{name}"] = f"{ASSET_DIST_DIR}/{directory}/{hashed_name}"
+            print(f"📦 {directory}/{name} -> {hashed_name}")
+    
+    with open(asset_manifest_path(), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    asset_manifest.cache_clear()
+    
+    if brotli is None:
+        print("⚠️ brotli is not installed, only gzip variants were written")
+    print(f"✅ Built {len(manifest)} static assets")
 
 # Test and Health endpoints
 @app.route('/api/test')
 def test_api():
-    with database_connection() as conn:
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) FROM reports")
-        reports_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM whatsapp_groups")
-        groups_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM forum_posts")
-        posts_count = cursor.fetchone()[0]
+    stats = stats_service.get()
 
     return jsonify({
         'success': True,
         'message': 'API is working!',
         'database': 'SQLite',
         'timestamp': datetime.utcnow().isoformat(),
-        'reports_count': reports_count,
-        'groups_count': groups_count,
-        'posts_count': posts_count
+        'reports_count': stats['total'],
+        'groups_count': stats['groups'],
+        'posts_count': stats['posts']
     })
 
 @app.route('/api/health')
 def health_check():
-    with database_connection() as conn:
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) FROM reports")
-        reports = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM whatsapp_groups")
-        groups = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM forum_posts")
-        posts = cursor.fetchone()[0]
+    stats = stats_service.get()
 
     return jsonify({
         'status': 'healthy',
         'database': 'sqlite',
         'timestamp': datetime.utcnow().isoformat(),
-        'reports': reports,
-        'groups': groups,
-        'posts': posts
+        'reports': stats['total'],
+        'groups': stats['groups'],
+        'posts': stats['posts'],
+        'stats_cache': stats_service.cache_info(),
+        'tile_cache': tile_cache.cache_info(),
+        'event_subscribers': event_broker.subscriber_count(),
+        'write_queue': get_report_write_queue().queue_info() if app.config["WRITE_BEHIND"] else None
     })
 
+@app.route('/metrics')
+def prometheus_metrics():
+    """Request and SQL metrics in the Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+def create_app(config=None):
+    """Return the configured application.
+    
+    Nothing here touches SQLite: the schema is created or migrated by
+    `flask init-db` (or `flask seed`) before workers start, and workers only
+    check its version when they first open the database. That keeps
+    pre-forked workers cheap to start and keeps them from racing to migrate.
+    """
+    if config:
+        app.config.update(config)
+    return app
+
 if __name__ == '__main__':
+    create_app()
+    migrate_database()
+    initialize_sample_data()
+
     print("🚀 Starting CityCare Application...")
     print("📊 Database: SQLite (Fast & Lightweight)")
     print("📱 CityCare is running on http://localhost:5000")
@@ -1035,6 +3422,7 @@ if __name__ == '__main__':
     print("\nAvailable endpoints:")
     print("  • /api/test - Test API connectivity")
     print("  • /api/health - Health check")
+    print("  • /metrics - Prometheus metrics")
     print("  • /api/reports - Get all reports")
     print("  • /api/submit-report - Submit new report")
     print("  • /api/chat - AI Chat endpoint")
@@ -0,0 +1,124 @@
+"""Benchmark the vectorized analytics behind /api/admin/analytics.
+
+Run from the repository root (requires numpy):
+
+    python benchmarks/bench_analytics.py
+
+Times compute_analytics() on a synthetic one million report snapshot, then,
+against a temporary database of 100k reports, the full read a SnapshotBuilder
+makes on its first sync and the sync plus snapshot() paid for each later data
+version after a few status updates.
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+import numpy as np
+
+DB_DIR = tempfile.mkdtemp(prefix="citycare-bench-")
+os.environ["DATABASE_PATH"] = os.path.join(DB_DIR, "bench.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+with redirect_stdout(io.StringIO()):
+    import app as citycare  # noqa: E402
+    citycare.migrate_database()
+import analytics  # noqa: E402
+
+SNAPSHOT_SIZE = 1_000_000
+DB_ROW_COUNT = 100_000
+UPDATES_PER_VERSION = 10
+REPEATS = 3
+
+CATEGORIES = ["Road Issues", "Water Supply", "Garbage", "Street Lights", "Drainage", "Parks", "Noise", "Other"]
+STATUSES = ["submitted", "in-progress", "resolved"]
+URGENCY = ["low", "medium", "high"]
+WARDS = [f"Ward {i}" for i in range(1, 41)] + [""]
+NOW = datetime(2025, 6, 15, tzinfo=timezone.utc)
+
+
+def synthetic_snapshot(size):
+    rng = np.random.default_rng(42)
+    end = int(NOW.timestamp())
+    created = rng.integers(end - 400 * 86400, end, size, dtype=np.int64)
+    resolved = created + rng.integers(0, 30 * 86400, size, dtype=np.int64)
+
+    def column(labels):
+        return rng.integers(0, len(labels), size).astype(np.int32), sorted(labels)
+
+    return analytics.ReportSnapshot(created, resolved, {
+        "status": column(STATUSES),
+        "category": column(CATEGORIES),
+        "urgency_level": column(URGENCY),
+        "ward": column(WARDS),
+    })
+
+
+def fill_database(count):
+    rows = [
+        (
+            f"bench-{i}", CATEGORIES[i % len(CATEGORIES)], f"Report {i}", "Description", URGENCY[i % 3],
+            20.59 + (i % 1000) * 1e-4, 78.96 + (i // 1000) * 1e-4, "Main Street", None,
+            WARDS[i % len(WARDS)], f"user{i % 500}@example.com", None, STATUSES[i % 3], "[]",
+            f"2025-{i % 12 + 1:02d}-01 10:00:00", f"2025-{i % 12 + 1:02d}-03 10:00:00"
+        )
+        for i in range(count)
+    ]
+    with citycare.database_connection() as conn:
+        conn.executemany('''
+            INSERT INTO reports (
+                id, category, title, description, urgency_level, latitude, longitude,
+                address, landmark, ward, contact_email, contact_phone, status, image_paths,
+                created_at, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
+
+
+def update_statuses(count):
+    with citycare.database_connection() as conn:
+        for i in range(count):
+            conn.execute(
+                "UPDATE reports SET status = 'resolved', updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (f"bench-{i * 7919 % DB_ROW_COUNT}",)
+            )
+        conn.commit()
+
+
+def incremental_sync(builder):
+    update_statuses(UPDATES_PER_VERSION)
+    with citycare.database_connection() as conn:
+        builder.sync(conn)
+    builder.snapshot()
+
+
+def best_of(function):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    snapshot = synthetic_snapshot(SNAPSHOT_SIZE)
+    compute = best_of(lambda: analytics.compute_analytics(snapshot, NOW))
+
+    fill_database(DB_ROW_COUNT)
+    with citycare.database_connection() as conn:
+        load = best_of(lambda: analytics.load_snapshot(conn))
+        builder = analytics.SnapshotBuilder()
+        builder.sync(conn)
+    sync = best_of(lambda: incremental_sync(builder))
+
+    print(f"compute_analytics, {SNAPSHOT_SIZE} reports, best of {REPEATS}:      {compute * 1000:.1f} ms")
+    print(f"full load, {DB_ROW_COUNT} reports, best of {REPEATS}:               {load * 1000:.1f} ms")
+    print(f"{UPDATES_PER_VERSION} updates + sync + snapshot(), {DB_ROW_COUNT} reports: {sync * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
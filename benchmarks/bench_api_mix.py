@@ -0,0 +1,220 @@
+"""Replay the API mix the frontends generate against a synthetic city.
+
+Run from the repository root:
+
+    python benchmarks/bench_api_mix.py --size 100k
+    python benchmarks/bench_api_mix.py --size 100k --save-baseline
+
+The dataset is built with citydata.py on first use and cached in --data-dir,
+since the 1m city takes minutes to generate. Page loads are drawn from a
+weighted mix of the track page (polling), the map, the admin dashboard and
+the community page, and every request they make goes through the Flask test
+client. Per-route p50/p95/p99 latency and throughput are printed.
+
+--save-baseline writes the results to benchmarks/baselines/. Later runs
+compare against the saved baseline and exit with status 1 when a route's p95
+is more than --tolerance slower. Baselines are machine specific, so only
+compare runs made on the same hardware.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+import citydata
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), "citycare-bench-data")
+PERCENTILES = (50, 95, 99)
+
+# The (route label, method, url, json body) requests each page load makes
+PAGE_WEIGHTS = {"track": 5, "map": 3, "admin": 1, "community": 1}
+
+
+def page_requests(page, rng, report_ids):
+    lat, lng = citydata.CITY_CENTRE
+    if page == "track":
+        return [
+            ("GET /api/user-reports", "GET", "/api/user-reports", None),
+            ("GET /api/reports/stats", "GET", "/api/reports/stats", None),
+        ]
+    if page == "map":
+        ward_lat = lat + rng.uniform(-0.05, 0.05)
+        ward_lng = lng + rng.uniform(-0.05, 0.05)
+        return [
+            ("GET /api/map/clusters z12", "GET",
+             f"/api/map/clusters?bbox={lat - 0.1},{lng - 0.1},{lat + 0.1},{lng + 0.1}&zoom=12", None),
+            ("GET /api/map/clusters z15", "GET",
+             f"/api/map/clusters?bbox={ward_lat - 0.01},{ward_lng - 0.01},{ward_lat + 0.01},{ward_lng + 0.01}&zoom=15", None),
+            ("GET /api/reports/nearby", "GET", f"/api/reports/nearby?lat={ward_lat}&lng={ward_lng}&radius=2", None),
+        ]
+    if page == "admin":
+        return [
+            ("GET /api/admin/analytics", "GET", "/api/admin/analytics", None),
+            ("GET /api/admin/reports", "GET", "/api/admin/reports", None),
+            ("GET /api/admin/users", "GET", "/api/admin/users", None),
+            ("GET /api/admin/reports/<id>/details", "GET", f"/api/admin/reports/{rng.choice(report_ids)}/details", None),
+            ("POST /api/reports/filter", "POST", "/api/reports/filter",
+             {"search": rng.choice(["pothole", "garbage", "water leak", "streetlight"]), "status": ["submitted", "in-progress"]}),
+        ]
+    return [
+        ("GET /api/forum-posts", "GET", "/api/forum-posts", None),
+        ("GET /api/whatsapp-groups", "GET", "/api/whatsapp-groups", None),
+    ]
+
+
+def load_app(size, data_dir):
+    """Import the app against the cached dataset, generating it if needed"""
+    path = os.path.join(data_dir, f"city-{size}.db")
+    if os.path.exists(path):
+        os.environ["DATABASE_PATH"] = path
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        with redirect_stdout(io.StringIO()):
+            import app as citycare
+            citycare.migrate_database()  # cached datasets may predate newer migrations
+        return citycare
+
+    os.makedirs(data_dir, exist_ok=True)
+    print(f"📝 Generating {size} city in {path}...")
+    start = time.perf_counter()
+    citycare = citydata.build_database(path, citydata.parse_size(size))
+    print(f"✅ Generated in {time.perf_counter() - start:.1f} s")
+    return citycare
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def run_mix(citycare, pages, threads, seed):
+    with citycare.database_connection() as conn:
+        report_ids = [row[0] for row in conn.execute("SELECT id FROM reports ORDER BY RANDOM() LIMIT 1000")]
+
+    rng = random.Random(seed)
+    plan = [
+        page_requests(page, rng, report_ids)
+        for page in rng.choices(list(PAGE_WEIGHTS), list(PAGE_WEIGHTS.values()), k=pages)
+    ]
+    timings = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    local = threading.local()
+
+    def load_page(requests):
+        client = getattr(local, "client", None) or citycare.app.test_client()
+        local.client = client
+        for label, method, url, body in requests:
+            start = time.perf_counter()
+            response = client.open(url, method=method, json=body)
+            elapsed = time.perf_counter() - start
+            with lock:
+                timings[label].append(elapsed)
+                if response.status_code != 200:
+                    errors[label] += 1
+
+    # One untimed pass over every distinct request warms caches and the pool
+    with redirect_stdout(io.StringIO()):
+        for page in PAGE_WEIGHTS:
+            load_page(page_requests(page, random.Random(seed), report_ids))
+        timings.clear()
+        errors.clear()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as executor:
+            list(executor.map(load_page, plan))
+        wall_seconds = time.perf_counter() - start
+
+    results = {}
+    for label, values in sorted(timings.items()):
+        values.sort()
+        results[label] = {
+            "requests": len(values),
+            "errors": errors[label],
+            **{f"p{p}_ms": round(percentile(values, p) * 1000, 3) for p in PERCENTILES},
+            "throughput_rps": round(len(values) / sum(values), 1),
+        }
+    total = sum(len(values) for values in timings.values())
+    return results, {"requests": total, "wall_seconds": round(wall_seconds, 3), "throughput_rps": round(total / wall_seconds, 1)}
+
+
+def print_results(results, overall, baseline):
+    print(f"{'route':<40} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8} {'p95 vs base':>12}")
+    for label, stats in results.items():
+        change = ""
+        if baseline and label in baseline["routes"]:
+            base_p95 = baseline["routes"][label]["p95_ms"]
+            change = f"{(stats['p95_ms'] / base_p95 - 1) * 100:+.0f}%" if base_p95 else ""
+        errors = f"  ({stats['errors']} errors)" if stats["errors"] else ""
+        print(f"{label:<40} {stats['requests']:>6} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+              f"{stats['p99_ms']:>9.2f} {stats['throughput_rps']:>8.1f} {change:>12}{errors}")
+    print(f"\n{overall['requests']} requests in {overall['wall_seconds']} s, {overall['throughput_rps']} req/s overall")
+
+
+def find_regressions(results, baseline, tolerance):
+    regressions = []
+    for label, stats in results.items():
+        base = baseline["routes"].get(label)
+        if base and base["p95_ms"] and stats["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append((label, base["p95_ms"], stats["p95_ms"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="10k", help="10k, 100k, 1m or a report count")
+    parser.add_argument("--pages", type=int, default=200, help="page loads to replay")
+    parser.add_argument("--threads", type=int, default=1, help="concurrent clients")
+    parser.add_argument("--seed", type=int, default=citydata.DEFAULT_SEED)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 slowdown, 0.25 = 25%%")
+    args = parser.parse_args()
+
+    size = args.size.lower()
+    citycare = load_app(size, args.data_dir)
+    results, overall = run_mix(citycare, args.pages, args.threads, args.seed)
+
+    baseline_path = os.path.join(BASELINE_DIR, f"api_mix_{size}_t{args.threads}.json")
+    baseline = None
+    if os.path.exists(baseline_path) and not args.save_baseline:
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    print(f"{size} city, {args.pages} page loads, {args.threads} thread(s)\n")
+    print_results(results, overall, baseline)
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path, "w") as baseline_file:
+            json.dump({
+                "size": size,
+                "pages": args.pages,
+                "threads": args.threads,
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "routes": results,
+                "overall": overall,
+            }, baseline_file, indent=2)
+        print(f"💾 Saved baseline to {baseline_path}")
+    elif baseline:
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for label, before, after in regressions:
+            print(f"❌ {label}: p95 {before:.2f} ms -> {after:.2f} ms")
+        if regressions:
+            raise SystemExit(1)
+        print(f"✅ No route regressed more than {args.tolerance:.0%} against {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark /api/reports/bulk against looping over /api/submit-report.
+
+Run from the repository root:
+
+    python benchmarks/bench_bulk_ingest.py
+
+Each run uses a throwaway SQLite database, so citycare.db is never touched.
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+DB_DIR = tempfile.mkdtemp(prefix="citycare-bench-")
+os.environ["DATABASE_PATH"] = os.path.join(DB_DIR, "bench.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+with redirect_stdout(io.StringIO()):
+    import app as citycare  # noqa: E402
+    citycare.migrate_database()
+
+REPORT_COUNTS = [100, 1000, 5000]
+
+
+def make_reports(prefix, count):
+    """Synthetic submissions with client-supplied ids"""
+    return [
+        {
+            "id": f"{prefix}-{i}",
+            "category": "Road Issues",
+            "title": f"Bulk report {i}",
+            "description": "Pothole reported by the call centre",
+            "urgency_level": "medium",
+            "latitude": 20.59 + (i % 100) * 0.001,
+            "longitude": 78.96 + (i // 100) * 0.001,
+            "address": "Bench Street",
+            "ward": f"Ward {i % 20}",
+            "contact_email": f"caller{i % 500}@example.com"
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    client = citycare.app.test_client()
+    print(f"{'reports':>8} {'loop s':>8} {'bulk s':>8} {'speedup':>8}")
+    for count in REPORT_COUNTS:
+        loop_reports = make_reports(f"loop{count}", count)
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            for report in loop_reports:
+                client.post("/api/submit-report", json=report)
+        loop_seconds = time.perf_counter() - start
+
+        body = "\n".join(json.dumps(report) for report in make_reports(f"bulk{count}", count))
+        start = time.perf_counter()
+        response = client.post("/api/reports/bulk", data=body, content_type="application/x-ndjson")
+        bulk_seconds = time.perf_counter() - start
+        assert response.get_json()["inserted_count"] == count
+
+        print(f"{count:>8} {loop_seconds:>8.2f} {bulk_seconds:>8.2f} {loop_seconds / bulk_seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
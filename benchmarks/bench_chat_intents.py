@@ -0,0 +1,101 @@
+"""Micro-benchmark chat intent matching.
+
+Run from the repository root:
+
+    python benchmarks/bench_chat_intents.py
+
+Compares the original substring loop over the reply templates with
+chat_intents.classify(), both on distinct messages (every call a cache miss)
+and on a realistic stream where a few common questions repeat (mostly cache
+hits). Messages where the two disagree are listed, since the substring loop
+picked the first template key found anywhere in the message.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chat_intents  # noqa: E402
+
+MESSAGE_COUNT = 50_000
+REPEATS = 3
+SEED = 2025
+
+LEGACY_KEYWORDS = ['report', 'track', 'pothole', 'garbage', 'water', 'tax', 'hello', 'thanks']
+
+COMMON_QUESTIONS = [
+    "Hello", "hi", "Thanks!", "How do I report a pothole?", "track my report",
+    "When is garbage collected?", "No water since morning", "How do I pay property tax?",
+]
+OPENERS = ["", "Hi, ", "Hello team, ", "Please help, ", "नमस्ते, "]
+SUBJECTS = [
+    "there is a huge pothole on {street}", "garbage has not been collected on {street} for a week",
+    "the water pipeline is leaking near {street}", "I want to report a broken streetlight on {street}",
+    "what is the status of my complaint about {street}", "how much is the house tax for {street}",
+    "the stadium near {street} needs repairs", "सड़क पर गड्ढे हैं {street}", "कचरा नहीं उठाया गया {street}",
+    "my complaint about {street} has no update", "thank you for fixing {street}",
+]
+STREETS = ["Main Street", "Station Road", "MG Road", "Temple Road", "Market Lane", "Ring Road", "Mill Road"]
+
+
+def legacy_intent(message):
+    """The original generate_ai_response() matching, without building replies"""
+    message_lower = message.lower()
+    for keyword in LEGACY_KEYWORDS:
+        if keyword in message_lower:
+            return keyword
+    return chat_intents.FALLBACK_INTENT
+
+
+def make_messages(rng):
+    distinct = [
+        f"{rng.choice(OPENERS)}{rng.choice(SUBJECTS).format(street=rng.choice(STREETS))} (#{index})"
+        for index in range(MESSAGE_COUNT)
+    ]
+    repeated = [
+        rng.choice(COMMON_QUESTIONS) if rng.random() < 0.8 else rng.choice(distinct)
+        for _ in range(MESSAGE_COUNT)
+    ]
+    return distinct, repeated
+
+
+def best_rate(function, messages):
+    best = float("inf")
+    for _ in range(REPEATS):
+        chat_intents.get_intent_matcher().match.cache_clear()
+        start = time.perf_counter()
+        for message in messages:
+            function(message)
+        best = min(best, time.perf_counter() - start)
+    return len(messages) / best
+
+
+def main():
+    distinct, repeated = make_messages(random.Random(SEED))
+    start = time.perf_counter()
+    chat_intents.get_intent_matcher()
+    matcher = chat_intents.get_intent_matcher()
+    keyword_count = sum(len(keywords) for _, keywords in chat_intents.INTENTS.values())
+    print(f"compiled {keyword_count} keywords into {matcher.pattern.groups} groups in "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    print(f"{'stream':<22} {'substring loop msg/s':>22} {'classify msg/s':>16}")
+    for name, messages in (("distinct messages", distinct), ("repeated questions", repeated)):
+        print(f"{name:<22} {best_rate(legacy_intent, messages):>22,.0f} "
+              f"{best_rate(chat_intents.classify, messages):>16,.0f}")
+
+    disagreements = {}
+    for subject in SUBJECTS + COMMON_QUESTIONS:
+        message = subject.format(street="Main Street")
+        before, after = legacy_intent(message), chat_intents.classify(message)
+        if before != after:
+            disagreements[message] = (before, after)
+    print(f"\n{len(disagreements)} sample messages now get a different intent:")
+    for message, (before, after) in disagreements.items():
+        print(f"  {message!r}: {before} -> {after}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Measure chat retrieval over a synthetic city.
+
+Run from the repository root:
+
+    python benchmarks/bench_chat_search.py --size 100k
+
+Builds the in-memory BM25 indexes over reports and forum posts the way the
+first /api/chat question does, reports their memory footprint, then times
+find_chat_matches() on a mix of citizen questions (index lookup plus fetching
+the matched rows). Finally reports are inserted one at a time, each followed
+by a question, to time the incremental sync. The dataset is cached in
+--data-dir like bench_api_mix.py's.
+"""
+import argparse
+import io
+import random
+import statistics
+import time
+import uuid
+from contextlib import redirect_stdout
+
+import citydata
+from bench_api_mix import DEFAULT_DATA_DIR, load_app, percentile
+
+QUESTIONS = [
+    "is the water issue in ward {ward} fixed?", "pothole on {street}", "garbage not collected near {landmark}",
+    "streetlight not working", "what about the park gate on {street}", "ward {ward}",
+    "traffic signal stuck in ward {ward}", "pipe leaks near {landmark}", "any update on the broken road near {landmark}?",
+]
+
+
+def index_bytes(index):
+    """Bytes held by an index's posting lists and per-document arrays"""
+    postings = sum(
+        numbers.buffer_info()[1] * numbers.itemsize + frequencies.buffer_info()[1] * frequencies.itemsize
+        for numbers, frequencies in index.postings.values()
+    )
+    arrays = sum(values.nbytes for values in (index.lengths, index.fingerprints, index.wards, index.alive))
+    return postings, arrays
+
+
+def time_questions(citycare, questions):
+    timings = []
+    for question in questions:
+        message = citycare.chat_intents.normalize_message(question)
+        start = time.perf_counter()
+        citycare.find_chat_matches(message)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="10k", help="10k, 100k, 1m or a report count")
+    parser.add_argument("--questions", type=int, default=2000)
+    parser.add_argument("--inserts", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=citydata.DEFAULT_SEED)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    args = parser.parse_args()
+
+    citycare = load_app(args.size.lower(), args.data_dir)
+    if citycare.load_chat_search() is None:
+        raise SystemExit("NumPy is not installed, /api/chat answers from templates only")
+
+    start = time.perf_counter()
+    citycare.find_chat_matches("warm up the indexes")
+    build_seconds = time.perf_counter() - start
+    indexes = citycare.chat_indexes
+    print(f"built indexes in {build_seconds:.2f} s\n")
+    print(f"{'index':<12} {'documents':>10} {'terms':>8} {'postings MB':>12} {'arrays MB':>10}")
+    for name, index in (("reports", indexes.reports), ("forum_posts", indexes.posts)):
+        postings, arrays = index_bytes(index)
+        print(f"{name:<12} {index.size:>10} {len(index.postings):>8} {postings / 1e6:>12.2f} {arrays / 1e6:>10.2f}")
+
+    rng = random.Random(args.seed)
+    questions = [
+        rng.choice(QUESTIONS).format(
+            ward=rng.randint(1, citydata.WARD_COUNT), street=rng.choice(citydata.STREETS),
+            landmark=rng.choice(citydata.LANDMARKS)
+        )
+        for _ in range(args.questions)
+    ]
+    timings = time_questions(citycare, questions)
+    print(f"\n{len(timings)} questions: p50 {percentile(timings, 50) * 1000:.2f} ms, "
+          f"p95 {percentile(timings, 95) * 1000:.2f} ms, p99 {percentile(timings, 99) * 1000:.2f} ms")
+
+    # Each insert bumps the reports data version, so every question syncs first
+    sync_timings = []
+    with redirect_stdout(io.StringIO()):
+        for index in range(args.inserts):
+            with citycare.database_connection() as conn:
+                conn.execute('''
+                    INSERT INTO reports (
+                        id, category, title, description, urgency_level, latitude, longitude,
+                        address, ward, contact_email
+                    ) VALUES (?, 'roads', ?, 'Inserted by the chat search benchmark', 'low', ?, ?, 'Bench Road', 'Ward 1', 'bench@example.com')
+                ''', (str(uuid.uuid4()), f"Benchmark sinkhole {index}", *citydata.CITY_CENTRE))
+                conn.commit()
+            sync_timings.extend(time_questions(citycare, [f"benchmark sinkhole {index}"]))
+    print(f"{args.inserts} inserts, each followed by a question: median {statistics.median(sync_timings) * 1000:.2f} ms")
+
+    with citycare.database_connection() as conn:
+        conn.execute("DELETE FROM reports WHERE contact_email = 'bench@example.com'")
+        conn.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark /api/user-reports as the number of comments grows.
+
+Run from the repository root:
+
+    python benchmarks/bench_comment_loading.py
+
+Each run uses a throwaway SQLite database, so citycare.db is never touched.
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager, redirect_stdout
+
+DB_DIR = tempfile.mkdtemp(prefix="citycare-bench-")
+os.environ["DATABASE_PATH"] = os.path.join(DB_DIR, "bench.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as citycare  # noqa: E402
+
+citycare.migrate_database()
+
+REPORT_COUNT = 1000
+COMMENTS_PER_REPORT = [0, 1, 5, 10]
+REPEATS = 5
+
+
+def seed(comments_per_report):
+    """Replace all reports with REPORT_COUNT reports carrying the given comment count"""
+    with citycare.database_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM report_comments")
+        cursor.execute("DELETE FROM reports")
+        reports = [
+            (
+                f"bench-{i}", "Road Issues", f"Bench report {i}", "Benchmark description",
+                "medium", 20.59, 78.96, "Bench Street", "", "Ward 1", "bench@example.com", ""
+            )
+            for i in range(REPORT_COUNT)
+        ]
+        cursor.executemany('''
+            INSERT INTO reports (id, category, title, description, urgency_level,
+            latitude, longitude, address, landmark, ward, contact_email, contact_phone)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', reports)
+        comments = [
+            (str(uuid.uuid4()), f"bench-{i}", "bench-user", "Bench User", "Same here")
+            for i in range(REPORT_COUNT)
+            for _ in range(comments_per_report)
+        ]
+        cursor.executemany('''
+            INSERT INTO report_comments (id, report_id, user_id, user_name, text)
+            VALUES (?, ?, ?, ?, ?)
+        ''', comments)
+        conn.commit()
+
+
+def count_queries():
+    """Count the SELECT statements a single /api/user-reports call issues"""
+    statements = []
+    original = citycare.database_connection
+
+    @contextmanager
+    def traced_connection():
+        with original() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                yield conn
+            finally:
+                conn.set_trace_callback(None)
+
+    citycare.database_connection = traced_connection
+    try:
+        with redirect_stdout(io.StringIO()):
+            citycare.app.test_client().get("/api/user-reports")
+    finally:
+        citycare.database_connection = original
+    return sum(1 for sql in statements if sql.lstrip().upper().startswith("SELECT"))
+
+
+def main():
+    client = citycare.app.test_client()
+    print(f"{'comments/report':>16} {'total comments':>15} {'queries':>8} {'best ms':>9}")
+    for per_report in COMMENTS_PER_REPORT:
+        seed(per_report)
+        timings = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                response = client.get("/api/user-reports")
+            timings.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200
+        print(f"{per_report:>16} {per_report * REPORT_COUNT:>15} {count_queries():>8} {min(timings):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Measure how long a fresh process takes to import app.py.
+
+Run from the repository root:
+
+    python benchmarks/bench_import_time.py
+
+Each sample is a new interpreter, as a pre-forking server's worker would be,
+and `import flask` alone is timed the same way so the app's own share is
+visible. app.py is byte-compiled first, as it would be in a deployment, so
+the numbers do not include compiling the source. The run fails if importing
+the app created the database file, since workers must not touch SQLite
+before their first request.
+"""
+import os
+import py_compile
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLES = 15
+
+TIMER = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+
+def time_import(module, database_path):
+    env = dict(os.environ, DATABASE_PATH=database_path)
+    timings = []
+    for _ in range(SAMPLES):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(root=ROOT, module=module)],
+            env=env, cwd=tempfile.gettempdir(), capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+
+def main():
+    database_path = os.path.join(tempfile.mkdtemp(prefix="citycare-bench-"), "import.db")
+    py_compile.compile(os.path.join(ROOT, "app.py"), doraise=True)
+    flask_timings = time_import("flask", database_path)
+    app_timings = time_import("app", database_path)
+
+    print(f"{'module':<8} {'median ms':>10} {'min ms':>8}  ({SAMPLES} fresh interpreters)")
+    for module, timings in (("flask", flask_timings), ("app", app_timings)):
+        print(f"{module:<8} {statistics.median(timings) * 1000:>10.1f} {min(timings) * 1000:>8.1f}")
+    print(f"app.py on top of flask: {(statistics.median(app_timings) - statistics.median(flask_timings)) * 1000:.1f} ms")
+
+    if os.path.exists(database_path):
+        print("❌ Importing app.py created the database")
+        raise SystemExit(1)
+    print("✅ Importing app.py did not touch the database")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Micro-benchmark report serialization on 100k rows.
+
+Run from the repository root:
+
+    python benchmarks/bench_serialization.py
+
+Compares the original dict_factory + serialize_report + json.dumps path with
+compile_report_serializer() and encode_json() (orjson when installed).
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+DB_DIR = tempfile.mkdtemp(prefix="citycare-bench-")
+os.environ["DATABASE_PATH"] = os.path.join(DB_DIR, "bench.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+with redirect_stdout(io.StringIO()):
+    import app as citycare  # noqa: E402
+    citycare.migrate_database()
+
+ROW_COUNT = 100_000
+REPEATS = 3
+
+
+class FakeCursor:
+    """Just enough of sqlite3.Cursor for dict_factory"""
+
+    def __init__(self, columns):
+        self.description = tuple((name, None, None, None, None, None, None) for name in columns)
+
+
+def make_rows():
+    with citycare.database_connection() as conn:
+        cursor = conn.execute("SELECT * FROM reports LIMIT 0")
+        columns = citycare.column_names(cursor)
+    rows = [
+        (
+            f"report-{i}", "Road Issues", f"Pothole number {i}",
+            "A long description of the problem that a citizen typed in " * 3,
+            "medium", 20.59 + i * 1e-6, 78.96 - i * 1e-6, "Main Street, City Center",
+            "Near Central Park" if i % 2 else None, f"Ward {i % 30}", f"user{i}@example.com",
+            "+1234567890", "submitted", '["photo.jpg"]' if i % 10 == 0 else "[]", i % 7, i % 3,
+            "2025-01-01 10:00:00", "2025-01-02 10:00:00"
+        )
+        for i in range(ROW_COUNT)
+    ]
+    return columns, rows
+
+
+def best_of(function):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    columns, rows = make_rows()
+    cursor = FakeCursor(columns)
+    serialize = citycare.compile_report_serializer(columns)
+
+    def original_serialize():
+        return [citycare.serialize_report(citycare.dict_factory(cursor, row)) for row in rows]
+
+    def compiled_serialize():
+        return [serialize(row) for row in rows]
+
+    original = original_serialize()
+    compiled = compiled_serialize()
+    assert original == compiled
+
+    results = [
+        ("dict_factory + serialize_report", best_of(original_serialize)),
+        ("compile_report_serializer", best_of(compiled_serialize)),
+        ("json.dumps (stdlib)", best_of(lambda: json.dumps(compiled))),
+        (f"encode_json ({'orjson' if citycare.orjson else 'stdlib'})", best_of(lambda: citycare.encode_json(compiled))),
+    ]
+
+    print(f"{ROW_COUNT} rows, best of {REPEATS}")
+    for name, seconds in results:
+        print(f"  {name:<34} {seconds * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Synthetic city dataset generator for benchmarks and load tests.
+
+Run from the repository root:
+
+    python benchmarks/citydata.py 100k --output /tmp/city-100k.db
+
+Sizes are 10k, 100k and 1m reports, or any integer. Reports cluster around
+40 ward centres whose popularity follows a Zipf-like curve, categories and
+urgency follow the mix the report form sees, and status depends on age so
+old reports are mostly resolved. Comments, forum posts and WhatsApp groups
+are scaled from the report count. The same seed always yields the same data.
+"""
+import argparse
+import io
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SEED = 2025
+
+CITY_CENTRE = (20.5937, 78.9629)
+WARD_COUNT = 40
+WARD_SPREAD_DEGREES = 0.006  # roughly 650 m standard deviation around a ward centre
+HISTORY_DAYS = 365
+INSERT_BATCH_SIZE = 20_000
+
+CATEGORIES = {
+    "roads": (24, ["Pothole on {street}", "Broken road surface near {landmark}", "Road caved in on {street}"]),
+    "sanitation": (21, ["Garbage not collected on {street}", "Overflowing bin near {landmark}", "Open dumping behind {landmark}"]),
+    "water": (16, ["No water supply on {street}", "Pipe leak near {landmark}", "Contaminated water in {street}"]),
+    "streetlights": (13, ["Streetlight not working on {street}", "Flickering lights near {landmark}"]),
+    "traffic": (11, ["Traffic signal stuck on {street}", "Missing road sign near {landmark}"]),
+    "parks": (6, ["Broken swings in park near {landmark}", "Park gate locked on {street}"]),
+    "other": (9, ["Stray animals near {landmark}", "Noise complaint on {street}"]),
+}
+URGENCY = {"low": 30, "medium": 50, "high": 20}
+# Mean days from submission to resolution, by urgency, and the share of
+# reports that sit in a backlog many times longer than that
+RESOLUTION_DAYS = {"low": 12.0, "medium": 6.0, "high": 2.0}
+NEGLECTED_SHARE = 0.25
+NEGLECTED_FACTOR = 40
+STREETS = [
+    "Main Street", "Station Road", "MG Road", "Temple Road", "Lake View Road", "Market Lane",
+    "Ring Road", "College Road", "Hospital Road", "Canal Street", "Gandhi Nagar Road",
+    "Nehru Marg", "Civil Lines", "Park Avenue", "Mill Road", "Bus Stand Road",
+]
+LANDMARKS = [
+    "Central Park", "City Mall", "Police Station", "Railway Station", "Government School",
+    "District Hospital", "Water Tank", "Bus Depot", "Shiv Temple", "Vegetable Market",
+    "Post Office", "Stadium", "Fire Station", "Community Hall",
+]
+FORUM_CATEGORIES = ["general", "infrastructure", "environment", "safety", "events"]
+COMMENT_COUNTS = ([0, 1, 2, 3, 5, 8], [55, 22, 11, 7, 4, 1])
+
+
+def parse_size(value):
+    """Accept one of SIZES or a plain integer"""
+    if value.lower() in SIZES:
+        return SIZES[value.lower()]
+    return int(value)
+
+
+def make_wards(rng):
+    """Ward names, centres and Zipf-like popularity weights"""
+    wards = []
+    for rank in range(1, WARD_COUNT + 1):
+        angle = rng.uniform(0, 2 * math.pi)
+        distance = 0.06 * math.sqrt(rng.random())  # denser wards near the centre
+        centre = (CITY_CENTRE[0] + distance * math.sin(angle), CITY_CENTRE[1] + distance * math.cos(angle))
+        wards.append((f"Ward {rank}", centre, 1 / rank ** 0.8))
+    return wards
+
+
+def weighted(rng, table):
+    """Draw a key from a {key: weight} or {key: (weight, ...)} table"""
+    keys = list(table)
+    weights = [value[0] if isinstance(value, tuple) else value for value in table.values()]
+    return rng.choices(keys, weights)[0]
+
+
+def timestamp(moment):
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def generate_reports(rng, count, now):
+    """Yield (report row, comment rows) pairs"""
+    wards = make_wards(rng)
+    ward_weights = [weight for _, _, weight in wards]
+    user_count = max(1, count // 4)
+
+    for _ in range(count):
+        ward, (ward_lat, ward_lng), _ = rng.choices(wards, ward_weights)[0]
+        category = weighted(rng, CATEGORIES)
+        urgency = weighted(rng, URGENCY)
+        street = rng.choice(STREETS)
+        landmark = rng.choice(LANDMARKS)
+        title = rng.choice(CATEGORIES[category][1]).format(street=street, landmark=landmark)
+
+        # Report volume grows over the year, so recent months are busier
+        age_days = HISTORY_DAYS * (1 - math.sqrt(rng.random()))
+        created = now - timedelta(days=age_days)
+        resolution_days = rng.expovariate(1 / RESOLUTION_DAYS[urgency])
+        if rng.random() < NEGLECTED_SHARE:
+            resolution_days *= NEGLECTED_FACTOR
+        if resolution_days < age_days:
+            status, updated = "resolved", created + timedelta(days=resolution_days)
+        elif rng.random() < 0.5:
+            status, updated = "in-progress", created + timedelta(days=rng.uniform(0, age_days))
+        else:
+            status, updated = "submitted", created
+
+        user = min(int(rng.paretovariate(1.2)), user_count)
+        report_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        comment_count = rng.choices(*COMMENT_COUNTS)[0]
+        comments = [
+            (
+                str(uuid.UUID(int=rng.getrandbits(128), version=4)), report_id,
+                f"resident-{rng.randrange(user_count)}", f"Resident {rng.randrange(user_count)}",
+                rng.choice(["Same problem here", "Still not fixed", "Thanks for reporting", "Reported this last week too"]),
+                timestamp(created + timedelta(days=rng.uniform(0, age_days)))
+            )
+            for _ in range(comment_count)
+        ]
+
+        report = (
+            report_id, category, title,
+            f"{title}. Reported by a resident of {ward}, close to {landmark}.",
+            urgency,
+            round(rng.gauss(ward_lat, WARD_SPREAD_DEGREES), 6),
+            round(rng.gauss(ward_lng, WARD_SPREAD_DEGREES), 6),
+            f"{rng.randint(1, 400)} {street}", landmark, ward,
+            f"resident{user}@example.com", f"+91{rng.randint(7000000000, 9999999999)}",
+            status, "[]", int(rng.expovariate(1 / 3)), comment_count,
+            timestamp(created), timestamp(updated)
+        )
+        yield report, comments
+
+
+def generate_forum_posts(rng, count, now):
+    for index in range(count):
+        created = now - timedelta(days=rng.uniform(0, HISTORY_DAYS))
+        author = f"Resident {rng.randrange(1000)}"
+        yield (
+            str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            f"Discussion {index}: {rng.choice(STREETS)} near {rng.choice(LANDMARKS)}",
+            "Has anyone else noticed this? Let's raise it with the ward office together.",
+            rng.choice(FORUM_CATEGORIES), author, "RS",
+            rng.randint(0, 40), rng.randint(0, 2000), rng.randint(0, 150),
+            timestamp(created), timestamp(created)
+        )
+
+
+def generate_groups(rng, count, now):
+    for index in range(count):
+        ward = f"Ward {index % WARD_COUNT + 1}"
+        yield (
+            str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            f"{ward} Residents {index // WARD_COUNT + 1}",
+            f"Neighbourhood updates for {ward}", ward,
+            f"https://chat.whatsapp.com/bench{index}",
+            rng.randint(5, 1000), rng.choice(["Very Active", "Active", "New"]),
+            timestamp(now - timedelta(days=rng.uniform(0, HISTORY_DAYS))), "user"
+        )
+
+
+def insert_batched(conn, sql, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == INSERT_BATCH_SIZE:
+            conn.executemany(sql, batch)
+            conn.commit()
+            batch = []
+    if batch:
+        conn.executemany(sql, batch)
+        conn.commit()
+
+
+def generate(conn, report_count, seed=DEFAULT_SEED, now=None):
+    """Fill an initialised CityCare database with a synthetic city"""
+    rng = random.Random(seed)
+    now = now or datetime.utcnow()
+    comments = []
+
+    def reports():
+        for report, report_comments in generate_reports(rng, report_count, now):
+            comments.extend(report_comments)
+            yield report
+
+    insert_batched(conn, '''
+        INSERT INTO reports (
+            id, category, title, description, urgency_level, latitude, longitude,
+            address, landmark, ward, contact_email, contact_phone, status, image_paths,
+            upvotes, comments_count, created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', reports())
+    insert_batched(conn, '''
+        INSERT INTO report_comments (id, report_id, user_id, user_name, text, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', comments)
+    insert_batched(conn, '''
+        INSERT INTO forum_posts (
+            id, title, content, category, author, author_initials, comments, views, likes,
+            created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', generate_forum_posts(rng, max(10, report_count // 50), now))
+    insert_batched(conn, '''
+        INSERT INTO whatsapp_groups (
+            id, name, description, location, link, member_count, activity, created_at, created_by
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', generate_groups(rng, WARD_COUNT + report_count // 5000, now))
+
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.commit()
+    return len(comments)
+
+
+def build_database(path, report_count, seed=DEFAULT_SEED):
+    """Create a fresh database at path and fill it; returns the app module"""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    os.environ["DATABASE_PATH"] = path
+    os.environ.setdefault("SLOW_QUERY_MS", "60000")  # bulk inserts are expected to be slow
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    with redirect_stdout(io.StringIO()):
+        import app as citycare
+        citycare.migrate_database()
+    with citycare.database_connection() as conn:
+        generate(conn, report_count, seed)
+    return citycare
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("size", help="10k, 100k, 1m or a report count")
+    parser.add_argument("--output", required=True, help="database file to create (replaced if it exists)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    report_count = parse_size(args.size)
+    start = time.perf_counter()
+    build_database(args.output, report_count, args.seed)
+    print(f"✅ Generated {report_count} reports in {args.output} ({time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Keyword intent matching for the /api/chat assistant.
+
+Every keyword of every intent, in every language, is compiled into a single
+regular expression with word boundaries, so a message is scanned once no
+matter how many keywords there are. Each match adds its weight to its
+intent's score, and the highest-scoring intent wins, which lets a specific
+word like "pothole" beat a generic one like "report" in the same message.
+
+The reply texts, including the summary of reports and forum posts found for
+a question, live here too, with one table per language.
+"""
+import re
+from functools import lru_cache
+
+# \w does not cover Indic vowel signs and viramas (they are combining marks),
+# so \b would split "गड्ढा" in the middle; the Indic blocks are added explicitly.
+WORD_CHAR = r'[\w\u0900-\u0DFF]'
+MAX_MESSAGE_CHARS = 2000
+MATCH_CACHE_SIZE = 4096
+DEFAULT_LANGUAGE = 'en'
+FALLBACK_INTENT = 'fallback'
+# Intents answered from the templates alone, without looking anything up
+SMALL_TALK_INTENTS = frozenset({'hello', 'thanks'})
+
+# intent: (priority for ties, {keyword: weight}). A trailing * matches any
+# word ending, and spaces match any run of whitespace.
+INTENTS = {
+    'pothole': (3, {
+        'pothole*': 3, 'pot hole*': 3, 'road damage': 3, 'broken road*': 3, 'crater*': 2,
+        'गड्ढ*': 3, 'सड़क टूट*': 3,
+    }),
+    'garbage': (3, {
+        'garbage': 3, 'trash': 3, 'rubbish': 3, 'litter*': 2, 'waste': 2, 'dustbin*': 2,
+        'sanitation': 2, 'garbage collection': 3,
+        'कचरा': 3, 'कचरे': 3, 'कूड़ा': 3, 'कूड़े': 3, 'सफाई': 2,
+    }),
+    'water': (3, {
+        'water': 3, 'water supply': 3, 'no water': 3, 'leak*': 2, 'pipeline*': 2, 'tap': 1,
+        'पानी': 3, 'जल आपूर्ति': 3, 'पाइप*': 2,
+    }),
+    'tax': (3, {
+        'tax': 3, 'taxes': 3, 'property tax': 3, 'house tax': 3,
+        'टैक्स': 3, 'संपत्ति कर': 3, 'कर भुगतान': 3,
+    }),
+    'track': (2, {
+        'track*': 3, 'status': 2, 'progress': 2, 'update*': 1, 'follow up': 2, 'where is my': 2,
+        'ट्रैक': 3, 'स्थिति': 2,
+    }),
+    'report': (1, {
+        'report*': 1, 'complain*': 1, 'complaint*': 1, 'raise an issue': 1,
+        'रिपोर्ट': 1, 'शिकायत': 1,
+    }),
+    'thanks': (1, {
+        'thank*': 2, 'thx': 2, 'dhanyavad': 2, 'shukriya': 2,
+        'धन्यवाद': 2, 'शुक्रिया': 2,
+    }),
+    'hello': (0, {
+        'hello': 1, 'hi': 1, 'hey': 1, 'namaste': 1, 'good morning': 1, 'good evening': 1,
+        'नमस्ते': 1, 'नमस्कार': 1,
+    }),
+}
+
+# Languages without their own table fall back to English
+TEMPLATES = {
+    'en': {
+        'report': "I can help you report a civic issue! You can file a report directly through our system. The report page will guide you through the process step by step.",
+        'track': "You can track your reported issues in the tracking section. It shows the current status, updates, and estimated resolution time for each report.",
+        'pothole': "For pothole reports, please provide the exact location, size, and a photo if possible. This helps our teams address the issue quickly.",
+        'garbage': "Garbage collection schedules vary by area. You can check your area's schedule or report missed collections through our system.",
+        'water': "Water supply issues should be reported immediately. Please provide your location and nature of the problem for quick resolution.",
+        'tax': "Property tax payments can be made online through our portal. You'll need your property ID and can choose from multiple payment options.",
+        'hello': "Hello! I'm CityCare Assistant. I can help you report civic issues, track existing reports, find city services, and answer questions about local governance.",
+        'thanks': "You're welcome! I'm here to help anytime. Feel free to ask if you need assistance with any civic matters.",
+        'fallback': "I understand you're asking about civic matters. I can help you with reporting issues, tracking reports, finding city services, or answering questions about local governance. What would you like to know more about?",
+        'reports_found': "These reports match your question:",
+        'posts_found': "Related community discussions:",
+    },
+    'hi': {
+        'report': "मैं नागरिक समस्या की रिपोर्ट करने में आपकी मदद कर सकती हूं! रिपोर्ट पेज आपको हर चरण में मार्गदर्शन करेगा।",
+        'track': "आप ट्रैकिंग सेक्शन में अपनी रिपोर्ट की स्थिति, अपडेट और अनुमानित समाधान समय देख सकते हैं।",
+        'pothole': "गड्ढे की रिपोर्ट के लिए कृपया सटीक स्थान, आकार और संभव हो तो एक फोटो दें। इससे हमारी टीम जल्दी काम कर पाएगी।",
+        'garbage': "कचरा संग्रह का समय क्षेत्र के अनुसार अलग होता है। आप अपने क्षेत्र का समय देख सकते हैं या छूटे हुए संग्रह की रिपोर्ट कर सकते हैं।",
+        'water': "पानी की आपूर्ति की समस्या तुरंत रिपोर्ट करें। जल्दी समाधान के लिए अपना स्थान और समस्या का विवरण दें।",
+        'tax': "संपत्ति कर का भुगतान हमारे पोर्टल पर ऑनलाइन किया जा सकता है। इसके लिए आपकी प्रॉपर्टी आईडी की आवश्यकता होगी।",
+        'hello': "नमस्ते! मैं CityCare Assistant हूं। मैं समस्याओं की रिपोर्ट, रिपोर्ट ट्रैक करने और शहर की सेवाओं की जानकारी में आपकी मदद कर सकती हूं।",
+        'thanks': "आपका स्वागत है! किसी भी नागरिक मामले में मदद के लिए मैं हमेशा यहां हूं।",
+        'fallback': "मैं समझती हूं कि आप नागरिक मामलों के बारे में पूछ रहे हैं। मैं समस्याओं की रिपोर्ट, रिपोर्ट ट्रैक करने और शहर की सेवाओं में मदद कर सकती हूं। आप क्या जानना चाहेंगे?",
+        'reports_found': "आपके सवाल से मिलती रिपोर्ट:",
+        'posts_found': "संबंधित सामुदायिक चर्चाएं:",
+    },
+}
+
+STATUS_LABELS = {
+    'en': {'submitted': 'submitted', 'in-progress': 'in progress', 'resolved': 'resolved'},
+    'hi': {'submitted': 'दर्ज', 'in-progress': 'कार्य जारी', 'resolved': 'हल हो गई'},
+}
+
+
+def keyword_pattern(keyword):
+    """Regex for one keyword: words joined by whitespace, optional trailing wildcard"""
+    prefix = keyword.endswith('*')
+    words = keyword.rstrip('*').split()
+    pattern = r'\s+'.join(re.escape(word) for word in words)
+    return pattern + (WORD_CHAR + '*' if prefix else '')
+
+
+class IntentMatcher:
+    """All intent keywords compiled into one alternation, one capture group per intent and weight"""
+
+    def __init__(self, intents):
+        self.priorities = {intent: priority for intent, (priority, _) in intents.items()}
+        keywords_by_group = {}
+        for intent, (_, keywords) in intents.items():
+            for keyword, weight in keywords.items():
+                keywords_by_group.setdefault((intent, weight), []).append(keyword)
+
+        # Longest first, so "water supply" is consumed before "water" can match
+        # at the same position; groups are ordered by their longest keyword
+        def length(keyword):
+            return len(keyword.rstrip('*'))
+        for keywords in keywords_by_group.values():
+            keywords.sort(key=length, reverse=True)
+        self.groups = sorted(
+            keywords_by_group, key=lambda group: length(keywords_by_group[group][0]), reverse=True
+        )
+        alternation = '|'.join(
+            '(' + '|'.join(map(keyword_pattern, keywords_by_group[group])) + ')' for group in self.groups
+        )
+        # The lookahead on first letters skips most positions before the alternation is tried
+        first_letters = ''.join(sorted({
+            re.escape(keyword[0]) for keywords in keywords_by_group.values() for keyword in keywords
+        }))
+        self.pattern = re.compile(f'(?=[{first_letters}])(?<!{WORD_CHAR})(?:{alternation})(?!{WORD_CHAR})')
+        self.match = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._match)
+
+    def _match(self, text):
+        scores = {}
+        for found in self.pattern.finditer(text):
+            intent, weight = self.groups[found.lastindex - 1]
+            scores[intent] = scores.get(intent, 0) + weight
+        if not scores:
+            return FALLBACK_INTENT
+        return max(scores, key=lambda intent: (scores[intent], self.priorities[intent]))
+
+
+def normalize_message(message):
+    """Case-folded, whitespace-collapsed message, truncated so matching stays bounded"""
+    return ' '.join(str(message)[:MAX_MESSAGE_CHARS].casefold().split())
+
+
+@lru_cache(maxsize=1)
+def get_intent_matcher():
+    """The matcher for INTENTS, compiled on first use"""
+    return IntentMatcher(INTENTS)
+
+
+def classify(message):
+    """Name of the best-matching intent, or FALLBACK_INTENT"""
+    return get_intent_matcher().match(normalize_message(message))
+
+
+def reply(intent, language):
+    """Template for an intent in the requested language, falling back to English"""
+    templates = TEMPLATES.get(language, TEMPLATES[DEFAULT_LANGUAGE])
+    return templates.get(intent, TEMPLATES[DEFAULT_LANGUAGE][intent])
+
+
+def describe_matches(reports, posts, language):
+    """Plain-text summary of the reports and forum posts found for a question"""
+    templates = TEMPLATES.get(language, TEMPLATES[DEFAULT_LANGUAGE])
+    statuses = STATUS_LABELS.get(language, STATUS_LABELS[DEFAULT_LANGUAGE])
+    sections = []
+    if reports:
+        lines = [templates['reports_found']]
+        for report in reports:
+            ward = f" ({report['ward']})" if report.get('ward') else ''
+            status = statuses.get(report['status'], report['status'])
+            lines.append(f"• {report['title']}{ward}: {status}")
+        sections.append('\n'.join(lines))
+    if posts:
+        sections.append('\n'.join([templates['posts_found']] + [f"• {post['title']}" for post in posts]))
+    return '\n\n'.join(sections)
@@ -0,0 +1,248 @@
+"""In-memory BM25 retrieval over reports and forum posts for the chat assistant.
+
+Each table gets an inverted index whose posting lists are typed arrays of
+int32 document numbers and float32 field-weighted term frequencies. A query
+is scored with NumPy over the posting lists of its own terms only, so common
+words cost a vectorized pass rather than a Python loop.
+
+An index follows its table incrementally. Each sync reads the rows changed
+since the previous sync, in the same changed-timestamp order the report
+changes feed uses, and reads report tombstones for deletes. A document whose
+text did not change (a status update, say) is left alone. Replaced and
+deleted documents are masked out until they make up a quarter of the index,
+and then it is rebuilt.
+"""
+import math
+import re
+from array import array
+from functools import lru_cache
+
+import numpy as np
+
+from chat_intents import WORD_CHAR
+
+TOKEN_PATTERN = re.compile(f'{WORD_CHAR}+')
+WARD_MENTION_PATTERN = re.compile(r'\bward\s*(?:no\.?|number|#)?\s*(\d+)\b', re.IGNORECASE)
+MIN_TERM_LENGTH = 2
+BM25_K1 = 1.2
+BM25_B = 0.75
+INITIAL_CAPACITY = 1024
+MAX_DEAD_SHARE = 0.25
+MIN_DEAD_FOR_REBUILD = 1000
+
+# Words that say what kind of answer is wanted rather than what it is about
+STOPWORDS = frozenset('''
+    a about after again all am an and any are as at be been before being but by can could
+    did do does done for from get got had has have how if in into is it its just me my no
+    not now of on or our please so still than that the their them there these this those
+    to was we were what when where which who why will with would yet you your
+    issue issues problem problems fixed resolved status update updates
+'''.split())
+
+
+class TableFeed:
+    """A table's searchable text columns and how its changes are found"""
+
+    def __init__(self, table, fields, changed_column, ward_column=None, tombstone_table=None):
+        self.table = table
+        self.fields = fields
+        self.changed_column = changed_column
+        self.ward_column = ward_column
+        self.tombstone_table = tombstone_table
+
+
+# Title words count three times, as in the bm25() weights of report search
+REPORTS_FEED = TableFeed(
+    'reports', {'title': 3.0, 'description': 1.0, 'address': 1.0, 'landmark': 1.0},
+    changed_column='updated_at', ward_column='ward', tombstone_table='report_tombstones'
+)
+FORUM_POSTS_FEED = TableFeed(
+    'forum_posts', {'title': 3.0, 'content': 1.0, 'category': 1.0},
+    changed_column='created_at'
+)
+
+
+@lru_cache(maxsize=65536)
+def index_term(word):
+    """The term a case-folded word is indexed under, or '' for stopwords"""
+    if len(word) < MIN_TERM_LENGTH or word in STOPWORDS:
+        return ''
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Index terms of a text: case-folded words without stopwords or a plural s"""
+    return [term for term in map(index_term, TOKEN_PATTERN.findall(text.casefold())) if term]
+
+
+def parse_question(message):
+    """Search terms of a chat message and the ward it mentions, if any"""
+    ward_mention = WARD_MENTION_PATTERN.search(message)
+    ward = f"Ward {ward_mention.group(1)}" if ward_mention else None
+    return tokenize(WARD_MENTION_PATTERN.sub(' ', message)), ward
+
+
+def grow(values, size, fill):
+    """A copy of a NumPy array with room for at least size entries"""
+    grown = np.full(max(size, 2 * len(values)), fill, dtype=values.dtype)
+    grown[:len(values)] = values
+    return grown
+
+
+class SearchIndex:
+    """BM25 inverted index over one table, kept in step by sync()"""
+
+    def __init__(self, feed):
+        self.feed = feed
+        self.reset()
+
+    def reset(self):
+        self.postings = {}  # term: (document numbers, weighted term frequencies)
+        self.keys = []  # document number: row id
+        self.documents = {}  # row id: number of its live document
+        self.lengths = np.zeros(INITIAL_CAPACITY, dtype=np.float32)
+        self.fingerprints = np.zeros(INITIAL_CAPACITY, dtype=np.int64)
+        self.wards = np.full(INITIAL_CAPACITY, -1, dtype=np.int32)
+        self.alive = np.zeros(INITIAL_CAPACITY, dtype=bool)
+        self.ward_codes = {}
+        self.total_length = 0.0
+        self.changed_cursor = None  # (latest changed timestamp, ids changed at that timestamp)
+        self.deleted_cursor = ('', set())
+
+    @property
+    def size(self):
+        return len(self.documents)
+
+    def add(self, key, texts, ward=None):
+        """Index a row's text, replacing an older version of the row if the text changed"""
+        fingerprint = hash((ward,) + texts)
+        existing = self.documents.get(key)
+        if existing is not None:
+            if self.fingerprints[existing] == fingerprint:
+                return
+            self.remove(key)
+
+        number = len(self.keys)
+        if number == len(self.alive):
+            self.lengths = grow(self.lengths, number + 1, 0)
+            self.fingerprints = grow(self.fingerprints, number + 1, 0)
+            self.wards = grow(self.wards, number + 1, -1)
+            self.alive = grow(self.alive, number + 1, False)
+
+        frequencies = {}
+        length = 0.0
+        for text, weight in zip(texts, self.feed.fields.values()):
+            for term in tokenize(text or ''):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+                length += weight
+        for term, frequency in frequencies.items():
+            entry = self.postings.get(term)
+            if entry is None:
+                entry = self.postings[term] = (array('i'), array('f'))
+            entry[0].append(number)
+            entry[1].append(frequency)
+
+        self.keys.append(key)
+        self.documents[key] = number
+        self.lengths[number] = length
+        self.fingerprints[number] = fingerprint
+        if ward:
+            self.wards[number] = self.ward_codes.setdefault(ward, len(self.ward_codes))
+        self.alive[number] = True
+        self.total_length += length
+
+    def remove(self, key):
+        number = self.documents.pop(key, None)
+        if number is not None:
+            self.alive[number] = False
+            self.total_length -= float(self.lengths[number])
+
+    def sync(self, conn):
+        """Apply the rows changed and deleted since the last sync"""
+        feed = self.feed
+        columns = ', '.join(
+            ['id', f'COALESCE({feed.changed_column}, \'\')']
+            + list(feed.fields)
+            + [feed.ward_column or 'NULL']
+        )
+        if self.changed_cursor is None:
+            previous, previous_ids = '', set()
+            rows = conn.execute(f"SELECT {columns} FROM {feed.table}")
+        else:
+            previous, previous_ids = self.changed_cursor
+            rows = conn.execute(f'''
+                SELECT {columns} FROM {feed.table}
+                WHERE {feed.changed_column} >= ?
+                ORDER BY {feed.changed_column}, id
+            ''', (previous,))
+
+        # Timestamps have one-second resolution, so the rows of the latest
+        # second are read again next time and skipped if already applied
+        latest, latest_ids = previous, set(previous_ids)
+        for key, changed, *texts, ward in rows:
+            if changed == previous and key in previous_ids:
+                continue
+            self.add(key, tuple(texts), ward)
+            if changed > latest:
+                latest, latest_ids = changed, {key}
+            elif changed == latest:
+                latest_ids.add(key)
+        self.changed_cursor = (latest, latest_ids)
+
+        if feed.tombstone_table:
+            previous, previous_ids = self.deleted_cursor
+            latest, latest_ids = previous, set(previous_ids)
+            rows = conn.execute(f'''
+                SELECT id, deleted_at FROM {feed.tombstone_table}
+                WHERE deleted_at >= ? ORDER BY deleted_at, id
+            ''', (previous,))
+            for key, deleted in rows:
+                if deleted == previous and key in previous_ids:
+                    continue
+                self.remove(key)
+                if deleted > latest:
+                    latest, latest_ids = deleted, {key}
+                elif deleted == latest:
+                    latest_ids.add(key)
+            self.deleted_cursor = (latest, latest_ids)
+
+        dead = len(self.keys) - self.size
+        if dead >= MIN_DEAD_FOR_REBUILD and dead > MAX_DEAD_SHARE * len(self.keys):
+            self.reset()
+            self.sync(conn)
+
+    def search(self, terms, limit, ward=None):
+        """Row ids of the best BM25 matches for the terms, best first"""
+        if not terms or not self.size:
+            return []
+        count = len(self.keys)
+        scores = np.zeros(count, dtype=np.float32)
+        lengths = self.lengths[:count]
+        average_length = max(self.total_length / self.size, 1.0)
+
+        for term in set(terms):
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            numbers = np.frombuffer(entry[0], dtype=np.int32)
+            frequencies = np.frombuffer(entry[1], dtype=np.float32)
+            idf = math.log(1 + (self.size - len(numbers) + 0.5) / (len(numbers) + 0.5))
+            norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths[numbers] / average_length)
+            # Each document appears once per posting list, so fancy-index += is safe
+            scores[numbers] += idf * frequencies * (BM25_K1 + 1) / (frequencies + norms)
+
+        scores[~self.alive[:count]] = 0
+        if ward is not None:
+            code = self.ward_codes.get(ward)
+            if code is None:
+                return []
+            scores[self.wards[:count] != code] = 0
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        # Best score first, newer documents first among equals
+        candidates = candidates[np.lexsort((-candidates, -scores[candidates]))]
+        return [self.keys[number] for number in candidates]
@@ -263,6 +263,13 @@
             }
         }
 
+        // Escape text for insertion as HTML
+        function escapeHTML(text) {
+            const div = document.createElement('div');
+            div.textContent = text;
+            return div.innerHTML;
+        }
+
         // Add message to chat window
         function addMessage(text, isUser = false, actions = []) {
             const messageDiv = document.createElement('div');
@@ -439,7 +446,8 @@
                 if (!response.ok) throw new Error(`Status: ${response.status}`);
 
                 const data = await response.json();
-                return data.reply;
+                // Replies can quote report titles, so they are escaped before addMessage renders them as HTML
+                return escapeHTML(data.reply).replace(/\n/g, '<br>');
             } catch (error) {
                 console.error('Chat API error:', error);
                 // Fallback to intent analysis if API fails
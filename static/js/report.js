@@ -426,9 +426,13 @@ fileInput.addEventListener("change", function () {
             });
         });
 
+// Files picked for upload, keyed so the preview's remove button can drop them
+const selectedFiles = new Map();
+
 function handleFiles(files) {
     for (let i = 0; i < files.length; i++) {
         const file = files[i];
+        const fileKey = `${file.name}-${file.size}-${file.lastModified}`;
 
         // Check file size (max 10MB)
         if (file.size > 10 * 1024 * 1024) {
@@ -442,6 +446,7 @@ function handleFiles(files) {
             continue;
         }
 
+        selectedFiles.set(fileKey, file);
         const reader = new FileReader();
 
         reader.onload = function (e) {
@@ -464,6 +469,7 @@ function handleFiles(files) {
 
             // Add remove functionality
             fileItem.querySelector(".remove").addEventListener("click", function () {
+                selectedFiles.delete(fileKey);
                 fileItem.remove();
             });
         };
@@ -498,7 +504,7 @@ document.getElementById("issueForm").addEventListener("submit", async function (
         ward: document.getElementById("ward").value,
         contact_email: document.getElementById("contactEmail").value,
         contact_phone: document.getElementById("contactPhone").value,
-        image_paths: getUploadedFiles()
+        image_paths: []
     };
 
     console.log("Submitting form data:", formData); // Debug log
@@ -510,6 +516,9 @@ document.getElementById("issueForm").addEventListener("submit", async function (
         submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Submitting...';
         submitBtn.disabled = true;
 
+        // Upload photos and videos first; the report stores their content hashes
+        formData.image_paths = await uploadMediaFiles();
+
         // Send to backend
         const response = await fetch('/api/submit-report', {
             method: 'POST',
@@ -553,22 +562,28 @@ async function testDatabaseConnection() {
 
 
 
-// Get uploaded files (placeholder - implement file upload logic)
-function getUploadedFiles() {
-    const fileItems = document.querySelectorAll('.file-item');
-    const files = [];
-    fileItems.forEach(item => {
-        // In real implementation, you would upload files to server
-        // and get their paths here
-        files.push('path/to/uploaded/file.jpg');
-    });
-    return files;
+// Upload the selected files and return their content hashes
+async function uploadMediaFiles() {
+    if (selectedFiles.size === 0) {
+        return [];
+    }
+
+    const body = new FormData();
+    selectedFiles.forEach(file => body.append('files', file));
+
+    const response = await fetch('/api/media', { method: 'POST', body: body });
+    const result = await response.json();
+    if (!result.success) {
+        throw new Error(result.message || 'Media upload failed');
+    }
+    return result.media.map(item => item.hash);
 }
 
 // Reset form function
 function resetForm() {
     document.getElementById("issueForm").reset();
     filePreview.innerHTML = "";
+    selectedFiles.clear();
     document.querySelectorAll(".urgency-option").forEach((opt) => opt.classList.remove("active"));
     document.querySelectorAll(".location-btn")[0].classList.add("active");
     
@@ -284,7 +284,26 @@ function refreshReports() {
     loadStats();
 }
 
-// Auto-refresh every 30 seconds
+// Live updates pushed by the server, batched so a burst triggers one refresh
+let liveRefreshTimer = null;
+
+function scheduleLiveRefresh() {
+    clearTimeout(liveRefreshTimer);
+    liveRefreshTimer = setTimeout(refreshReports, 500);
+}
+
+// The server only streams when it says so on the script tag; otherwise the
+// 30 second polling below is all there is
+const liveUpdates = document.currentScript && document.currentScript.dataset.liveUpdates === 'on';
+
+if (liveUpdates && window.EventSource) {
+    const reportEvents = new EventSource('/api/events');
+    ['report', 'status', 'comment', 'deleted'].forEach(eventType => {
+        reportEvents.addEventListener(eventType, scheduleLiveRefresh);
+    });
+}
+
+// Auto-refresh every 30 seconds as a fallback
 setInterval(refreshReports, 30000);
 
 // Make functions globally available